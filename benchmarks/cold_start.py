@@ -0,0 +1,112 @@
+"""Time to first request at steady latency after a worker starts.
+
+Starts the app under uvicorn twice, with and without the lifespan warm-up,
+against the database configured in .env. Each run polls until the first
+response, then sends waves of ``concurrency`` requests. The app is "steady"
+once a wave's p50 is within 25% of the p50 of the last half of the waves.
+Requests carry an access token signed with the configured SECRET_KEY.
+
+    python -m benchmarks.cold_start --path "/api/v1/users?limit=10" --waves 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import summarize
+from src.service.user import LoginService
+
+STEADY_TOLERANCE = 1.25
+
+
+async def first_response(client: httpx.AsyncClient, url: str, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            (await client.get(url)).raise_for_status()
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.01)
+    raise TimeoutError(f"{url} did not answer within {timeout}s")
+
+
+async def measure(
+    warm_up_connections: int | None,
+    url: str,
+    waves: int,
+    concurrency: int,
+    port: int,
+    token: str,
+) -> None:
+    env = dict(os.environ)
+    if warm_up_connections is not None:
+        env["POSTGRES_WARM_UP_CONNECTIONS"] = str(warm_up_connections)
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            *("-m", "uvicorn", "src.web:init_app", "--factory"),
+            *("--port", str(port), "--log-level", "warning"),
+        ],
+        env=env,
+    )
+    try:
+        async with httpx.AsyncClient(
+            timeout=30.0, headers={"Authorization": f"Bearer {token}"}
+        ) as client:
+            await first_response(client, url, timeout=60.0)
+            first = time.perf_counter() - started
+            latencies: list[float] = []
+            wave_p50s: list[float] = []
+            wave_ends: list[float] = []
+
+            async def timed() -> None:
+                sent = time.perf_counter()
+                (await client.get(url)).raise_for_status()
+                latencies.append(time.perf_counter() - sent)
+
+            for _ in range(waves):
+                wave_start = len(latencies)
+                await asyncio.gather(*(timed() for _ in range(concurrency)))
+                wave_p50s.append(statistics.median(latencies[wave_start:]))
+                wave_ends.append(time.perf_counter() - started)
+    finally:
+        server.terminate()
+        server.wait()
+
+    steady = statistics.median(wave_p50s[waves // 2 :])
+    steady_at = next(
+        end
+        for p50, end in zip(wave_p50s, wave_ends, strict=True)
+        if p50 <= steady * STEADY_TOLERANCE
+    )
+    print(f"  first response after {first:.2f}s")
+    print(f"  steady latency (p50 {steady * 1000:.2f}ms) after {steady_at:.2f}s")
+    print(f"  first wave p50={wave_p50s[0] * 1000:.2f}ms")
+    print(f"  all requests: {summarize(latencies)}")
+
+
+def main(path: str, waves: int, concurrency: int, port: int) -> None:
+    url = f"http://127.0.0.1:{port}{path}"
+    token = LoginService().generate_access_token(str(uuid.uuid4()))
+    print("without warm-up")
+    asyncio.run(measure(0, url, waves, concurrency, port, token))
+    print("with warm-up")
+    asyncio.run(measure(None, url, waves, concurrency, port, token))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="/api/v1/users?limit=10")
+    parser.add_argument("--waves", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+    main(args.path, args.waves, args.concurrency, args.port)
@@ -0,0 +1,31 @@
+import statistics
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    def __str__(self) -> str:
+        return (
+            f"n={self.count} p50={self.p50 * 1000:.2f}ms p95={self.p95 * 1000:.2f}ms "
+            f"p99={self.p99 * 1000:.2f}ms max={self.max * 1000:.2f}ms"
+        )
+
+
+def summarize(latencies: list[float]) -> LatencySummary:
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else 0.0
+        return LatencySummary(len(latencies), value, value, value, value)
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return LatencySummary(
+        count=len(latencies),
+        p50=quantiles[49],
+        p95=quantiles[94],
+        p99=quantiles[98],
+        max=max(latencies),
+    )
@@ -0,0 +1,56 @@
+"""Per-request cost of resolving a use case, transient vs precompiled container.
+
+Nothing is connected to; the settings below only have to be valid.
+
+    python -m benchmarks.container_resolution --iterations 100000
+"""
+
+import argparse
+import os
+import time
+
+for name, value in {
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "benchmark",
+    "SECRET_KEY": "benchmark",
+    "SENDGRID_KEY": "benchmark",
+    "FROM_EMAIL": "noreply@example.com",
+}.items():
+    os.environ.setdefault(name, value)
+
+from src.core.config.containers import init_container  # noqa: E402
+from src.domain.user.use_cases import LoginUserUseCase  # noqa: E402
+
+
+def measure(precompiled: bool, iterations: int) -> float:
+    started = time.perf_counter()
+    container = init_container(precompiled=precompiled)
+    built = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        container.resolve(LoginUserUseCase)
+    per_resolve = (time.perf_counter() - started) / iterations
+    print(
+        f"  init={built * 1000:.2f}ms resolve LoginUserUseCase="
+        f"{per_resolve * 1_000_000:.2f}us"
+    )
+    return per_resolve
+
+
+def main(iterations: int) -> None:
+    print("transient (the old behaviour)")
+    transient = measure(False, iterations)
+    print("precompiled")
+    precompiled = measure(True, iterations)
+    print(f"per request resolution is {transient / precompiled:.1f}x cheaper")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,94 @@
+"""Forget-password send latency, blocking SendGrid call vs the dispatch queue.
+
+Runs against the local SendGrid stub. The blocking path opens a new client per
+email like the old ``SendGridAPIClient`` did; the queued path only pays for
+``enqueue`` and the emails are delivered in batches by the background worker.
+
+    python -m benchmarks.email_dispatch --emails 200 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import summarize
+from benchmarks.stubs.sendgrid import StubServer
+from src.infrastructure.email.dispatcher import EmailMessage, SendGridEmailDispatcher
+from src.service.user import OTP_EMAIL_HTML_CONTENT, OTP_EMAIL_SUBJECT
+
+FROM_EMAIL = "noreply@example.com"
+
+
+def message(index: int) -> EmailMessage:
+    return EmailMessage(
+        to=f"user{index}@example.com",
+        subject=OTP_EMAIL_SUBJECT,
+        html_content=OTP_EMAIL_HTML_CONTENT,
+        substitutions={"-code-": f"{index:06d}"},
+    )
+
+
+def blocking(url: str, emails: int) -> None:
+    latencies = []
+    for index in range(emails):
+        started = time.perf_counter()
+        with httpx.Client() as client:
+            client.post(
+                url,
+                json={
+                    "personalizations": [{"to": [{"email": message(index).to}]}],
+                    "from": {"email": FROM_EMAIL},
+                    "subject": OTP_EMAIL_SUBJECT,
+                    "content": [{"type": "text/html", "value": "code"}],
+                },
+            ).raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    print(f"  send latency: {summarize(latencies)}")
+
+
+async def queued(url: str, emails: int) -> None:
+    dispatcher = SendGridEmailDispatcher(
+        api_key="benchmark",
+        from_email=FROM_EMAIL,
+        api_url=url,
+        max_queue_size=emails,
+        max_batch_size=1000,
+        max_retries=5,
+        backoff_seconds=0.05,
+        timeout=10.0,
+    )
+    latencies = []
+    started = time.perf_counter()
+    for index in range(emails):
+        enqueued = time.perf_counter()
+        dispatcher.enqueue(message(index))
+        latencies.append(time.perf_counter() - enqueued)
+        # requests arrive spread out, not all in one tick
+        await asyncio.sleep(0)
+    await dispatcher.close(timeout=60.0)
+    delivered = time.perf_counter() - started
+    print(f"  enqueue latency: {summarize(latencies)}")
+    print(f"  all delivered after {delivered:.2f}s, {dispatcher.stats}")
+
+
+def main(emails: int, latency: float, failure_rate: float, port: int) -> None:
+    with StubServer(port, latency, 0.0) as stub:
+        print("blocking send per request")
+        blocking(stub.url, emails)
+        print(f"  stub {stub.stats}")
+    with StubServer(port, latency, failure_rate) as stub:
+        print(f"dispatch queue (stub failure rate {failure_rate})")
+        asyncio.run(queued(stub.url, emails))
+        print(f"  stub {stub.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+    main(args.emails, args.latency, args.failure_rate, args.port)
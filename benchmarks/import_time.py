@@ -0,0 +1,70 @@
+"""Import-time budget for ``src.web``, the cost every worker pays on startup.
+
+Parses ``python -X importtime`` and fails when the cumulative import of the
+module exceeds the budget, or when a dependency that is meant to load on first
+use (python-jose, passlib, redis, httpx, brotli) is imported eagerly.
+
+The default budget is measured rather than aspirational: fastapi on its own
+takes about 600ms on a 1 vCPU container and SQLAlchemy, which the routes
+need through the container, about 400ms more, so src.web imports in about
+1100ms there. Compare ``--module fastapi`` on the same machine before
+reading much into an absolute number.
+
+    python -m benchmarks.import_time --budget-ms 1400
+"""
+
+import argparse
+import subprocess
+import sys
+
+LAZY_MODULES = ("jose", "passlib", "bcrypt", "redis", "httpx", "brotli")
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Module name -> (self us, cumulative us)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(module: str, budget_ms: float, runs: int, top: int) -> None:
+    # the first run also pays for writing bytecode, keep the fastest
+    times = min(
+        (import_times(module) for _ in range(runs)), key=lambda run: run[module][1]
+    )
+    cumulative_ms = times[module][1] / 1000
+    for name, (self_us, _) in sorted(
+        times.items(), key=lambda item: item[1][0], reverse=True
+    )[:top]:
+        print(f"  {self_us / 1000:8.2f}ms  {name}")
+
+    eager = sorted(name for name in times if name.split(".")[0] in LAZY_MODULES)
+    failed = False
+    if eager:
+        print(f"FAIL imported eagerly: {', '.join(eager)}")
+        failed = True
+    status = "ok" if cumulative_ms <= budget_ms else "FAIL"
+    print(f"{status} import {module} took {cumulative_ms:.1f}ms (budget {budget_ms}ms)")
+    failed = failed or status == "FAIL"
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="src.web")
+    parser.add_argument("--budget-ms", type=float, default=1400.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.module, args.budget_ms, args.runs, args.top)
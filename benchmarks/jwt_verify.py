@@ -0,0 +1,46 @@
+"""Access token verification throughput, python-jose decode vs TokenService.
+
+python -m benchmarks.jwt_verify --iterations 100000 --tokens 1000
+"""
+
+import argparse
+import time
+from datetime import UTC, datetime, timedelta
+
+from jose import jwt
+
+from src.service.user import TokenService
+
+SECRET_KEY = "benchmark-secret"
+ALGORITHM = "HS256"
+
+
+def main(iterations: int, tokens: int) -> None:
+    expire = datetime.now(UTC) + timedelta(minutes=15)
+    issued = [
+        jwt.encode({"sub": str(index), "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
+        for index in range(tokens)
+    ]
+
+    started = time.perf_counter()
+    for index in range(iterations):
+        jwt.decode(issued[index % tokens], SECRET_KEY, algorithms=[ALGORITHM])
+    uncached = iterations / (time.perf_counter() - started)
+
+    token_service = TokenService(SECRET_KEY, ALGORITHM, max_size=tokens)
+    started = time.perf_counter()
+    for index in range(iterations):
+        token_service.verify_token(issued[index % tokens])
+    cached = iterations / (time.perf_counter() - started)
+
+    print(f"uncached verifications/s={uncached:.0f}")
+    print(f"cached   verifications/s={cached:.0f} ({cached / uncached:.1f}x)")
+    print(f"cache {token_service.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.iterations, args.tokens)
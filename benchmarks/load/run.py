@@ -0,0 +1,188 @@
+"""Load test of the register, login and user read endpoints.
+
+Starts ``src.web:init_app`` under uvicorn against the database in .env, with
+SendGrid replaced by the local stub, registers fixture users through the API,
+then drives each scenario with ``--concurrency`` concurrent clients. Results
+are compared with the stored baseline and the run fails when throughput drops
+or p99 grows past the thresholds.
+
+    python -m benchmarks.load.run --requests 2000 --concurrency 32
+    python -m benchmarks.load.run --update-baseline
+    python -m benchmarks.load.run --url http://127.0.0.1:8000  # running app
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import summarize
+from benchmarks.load.scenarios import Fixtures, Request, scenarios, setup
+from benchmarks.stubs.sendgrid import StubServer
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    requests: int
+    errors: int
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, request: Request, requests: int, concurrency: int
+) -> ScenarioResult:
+    latencies: list[float] = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                response = await request(client, index)
+                failed = response.is_error
+            except httpx.TransportError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    summary = summarize(latencies)
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        throughput=requests / elapsed,
+        p50=summary.p50,
+        p95=summary.p95,
+        p99=summary.p99,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            (await client.get("/api/v1/health")).raise_for_status()
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"the app did not start within {timeout}s")
+
+
+async def run(
+    url: str, requests: int, concurrency: int, users: int, only: list[str] | None
+) -> dict[str, ScenarioResult]:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        await wait_until_ready(client, timeout=60.0)
+        fixtures = Fixtures(run_id=uuid.uuid4().hex[:8])
+        await setup(client, fixtures, users)
+        results = {}
+        for name, request in scenarios(fixtures).items():
+            if only and name not in only:
+                continue
+            results[name] = await run_scenario(client, request, requests, concurrency)
+            print(format_result(name, results[name]))
+        return results
+
+
+def format_result(name: str, result: ScenarioResult) -> str:
+    return (
+        f"{name:<12} req/s={result.throughput:8.1f} p50={result.p50 * 1000:7.2f}ms "
+        f"p95={result.p95 * 1000:7.2f}ms p99={result.p99 * 1000:7.2f}ms "
+        f"errors={result.errors}"
+    )
+
+
+def compare(
+    results: dict[str, ScenarioResult],
+    baseline: dict[str, dict],
+    max_throughput_drop: float,
+    max_p99_increase: float,
+) -> bool:
+    passed = True
+    for name, result in results.items():
+        if result.errors:
+            print(f"FAIL {name}: {result.errors} requests failed")
+            passed = False
+        if name not in baseline:
+            print(f"new  {name}: no baseline")
+            continue
+        expected = baseline[name]
+        throughput = result.throughput / expected["throughput"] - 1
+        p99 = result.p99 / expected["p99"] - 1
+        regressed = throughput < -max_throughput_drop or p99 > max_p99_increase
+        passed = passed and not regressed
+        print(
+            f"{'FAIL' if regressed else 'ok  '} {name}: "
+            f"req/s {throughput:+.1%}, p99 {p99:+.1%}"
+        )
+    return passed
+
+
+def main(args: argparse.Namespace) -> None:
+    with contextlib.ExitStack() as stack:
+        url = args.url
+        if url is None:
+            url = f"http://127.0.0.1:{args.port}"
+            stub = stack.enter_context(StubServer(args.stub_port, 0.05, 0.0))
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    *("-m", "uvicorn", "src.web:init_app", "--factory"),
+                    *("--port", str(args.port), "--log-level", "warning"),
+                ],
+                env={**os.environ, "SENDGRID_API_URL": stub.url},
+            )
+            stack.callback(server.wait)
+            stack.callback(server.terminate)
+        results = asyncio.run(
+            run(url, args.requests, args.concurrency, args.users, args.scenario)
+        )
+
+    if args.update_baseline:
+        BASELINE.write_text(
+            json.dumps({name: asdict(r) for name, r in results.items()}, indent=2)
+            + "\n"
+        )
+        print(f"baseline written to {BASELINE}")
+        return
+    if not BASELINE.exists():
+        print(f"no baseline at {BASELINE}, record one with --update-baseline")
+        return
+    baseline = json.loads(BASELINE.read_text())
+    if not compare(results, baseline, args.max_throughput_drop, args.max_p99_increase):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="an already running app, skips starting one")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--scenario", action="append", help="run only these")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--stub-port", type=int, default=8025)
+    parser.add_argument("--max-throughput-drop", type=float, default=0.10)
+    parser.add_argument("--max-p99-increase", type=float, default=0.20)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    main(args)
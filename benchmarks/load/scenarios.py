@@ -0,0 +1,73 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+PASSWORD = "Benchmark#2024"
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Fixtures:
+    """Users registered before the measured scenarios, and their tokens"""
+
+    run_id: str
+    usernames: list[str] = field(default_factory=list)
+    tokens: list[str] = field(default_factory=list)
+
+
+def register_payload(run_id: str, prefix: str, index: int) -> dict:
+    username = f"{prefix}-{run_id}-{index}"
+    return {
+        "username": username,
+        "email": f"{username}@load.example.com",
+        "password": PASSWORD,
+    }
+
+
+async def setup(client: httpx.AsyncClient, fixtures: Fixtures, users: int) -> None:
+    for index in range(users):
+        payload = register_payload(fixtures.run_id, "fixture", index)
+        (await client.post("/api/v1/users", json=payload)).raise_for_status()
+        fixtures.usernames.append(payload["username"])
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"username": payload["username"], "password": PASSWORD},
+        )
+        response.raise_for_status()
+        fixtures.tokens.append(response.json()["access_token"])
+
+
+def scenarios(fixtures: Fixtures) -> dict[str, Request]:
+    async def register(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.post(
+            "/api/v1/users", json=register_payload(fixtures.run_id, "register", index)
+        )
+
+    async def login(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        username = fixtures.usernames[index % len(fixtures.usernames)]
+        return await client.post(
+            "/api/v1/auth/login", json={"username": username, "password": PASSWORD}
+        )
+
+    async def get_user(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        token = fixtures.tokens[index % len(fixtures.tokens)]
+        return await client.get(
+            "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    async def list_users(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        token = fixtures.tokens[index % len(fixtures.tokens)]
+        return await client.get(
+            "/api/v1/users",
+            params={"limit": 50},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    return {
+        "register": register,
+        "login": login,
+        "get_user": get_user,
+        "list_users": list_users,
+    }
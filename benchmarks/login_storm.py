@@ -0,0 +1,74 @@
+"""p99 latency of unrelated requests while a login storm is running.
+
+Compares bcrypt on the event loop (the old behaviour) against
+``PasswordHashingPool``. Each "unrelated request" is a 1ms sleep; any time on
+top of that is event loop stall.
+
+    python -m benchmarks.login_storm --logins 200 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import summarize
+from src.service.hashing import PasswordHashingPool, hash_password, verify_password
+
+PASSWORD = "Benchmark#2024"
+
+
+async def unrelated_requests(stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        latencies.append(time.perf_counter() - started)
+
+
+async def login_storm(verify, hashed: str, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        async with semaphore:
+            await verify(PASSWORD, hashed)
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+
+
+async def measure(verify, hashed: str, logins: int, concurrency: int) -> None:
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    probe = asyncio.create_task(unrelated_requests(stop, latencies))
+    started = time.perf_counter()
+    await login_storm(verify, hashed, logins, concurrency)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    print(f"  logins/s={logins / elapsed:.1f}")
+    print(f"  unrelated requests: {summarize(latencies)}")
+
+
+async def main(logins: int, concurrency: int, workers: int | None) -> None:
+    hashed = hash_password(PASSWORD)
+
+    async def inline_verify(plain_password: str, hash_password: str) -> bool:
+        return verify_password(plain_password, hash_password)
+
+    print("bcrypt on the event loop")
+    await measure(inline_verify, hashed, logins, concurrency)
+
+    pool = PasswordHashingPool(max_workers=workers)
+    try:
+        await pool.verify(PASSWORD, hashed)
+        print("bcrypt in PasswordHashingPool")
+        await measure(pool.verify, hashed, logins, concurrency)
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.workers))
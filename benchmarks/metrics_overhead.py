@@ -0,0 +1,67 @@
+"""Per-request cost of the Prometheus instrumentation.
+
+Drives a minimal FastAPI app in-process through httpx's ASGI transport, with
+and without ``MetricsMiddleware``, and times a bare histogram observation.
+
+    python -m benchmarks.metrics_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.helper.metrics import TOKEN_ENCODE, MetricsMiddleware
+
+
+def create_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict:
+        return {"item_id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def per_request(instrumented: bool, requests: int) -> float:
+    transport = httpx.ASGITransport(app=create_app(instrumented))
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        for index in range(100):
+            await client.get(f"/items/{index}")
+        started = time.perf_counter()
+        for index in range(requests):
+            await client.get(f"/items/{index}")
+        return (time.perf_counter() - started) / requests
+
+
+def main(requests: int) -> None:
+    # alternate so drift in the machine hits both sides equally
+    plain, instrumented = [], []
+    for _ in range(3):
+        plain.append(asyncio.run(per_request(False, requests)))
+        instrumented.append(asyncio.run(per_request(True, requests)))
+    plain_us, instrumented_us = min(plain) * 1e6, min(instrumented) * 1e6
+    print(f"request without metrics={plain_us:.1f}us")
+    print(
+        f"request with metrics={instrumented_us:.1f}us"
+        f" (+{instrumented_us - plain_us:.1f}us,"
+        f" {(instrumented_us / plain_us - 1) * 100:.1f}%)"
+    )
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        with TOKEN_ENCODE.time():
+            pass
+    print(f"histogram timer={(time.perf_counter() - started) / requests * 1e6:.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.requests)
@@ -0,0 +1,106 @@
+"""Query-plan regression check for the hot user queries.
+
+Every statement the repository issues on a hot path is planned with
+EXPLAIN (FORMAT JSON) against the Postgres configured in .env (migrations
+applied). Sequential scans are disabled for the session, so the planner only
+picks one when no index can serve the query; the check fails if a plan scans
+"user" sequentially or misses the index it is expected to use.
+
+    python -m benchmarks.query_plans
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy import TextClause, text
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.expression import Executable
+
+from src.domain.user.entities import User
+from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.models.user import UserORM
+from src.infrastructure.postgresql.queries.user import (
+    delete_user,
+    select_existing_usernames_and_emails,
+    select_user_by_email,
+    select_user_by_oid,
+    select_user_by_username,
+    select_users_page,
+    update_user,
+)
+
+
+def explain(statement: Executable, dialect: Dialect) -> TextClause:
+    # EXPLAIN takes no bind parameters, so the values are rendered inline
+    sql = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    return text(f"EXPLAIN (FORMAT JSON) {sql}")
+
+
+SAMPLE_OID = uuid.uuid4()
+SAMPLE_USER = User(
+    oid=SAMPLE_OID,
+    created_at=None,
+    updated_at=None,
+    email="plan@example.com",
+    username="plan",
+    password="x",
+)
+
+# name -> (statement, indexes the plan has to use)
+HOT_QUERIES = {
+    "get_by_username": (select_user_by_username("plan"), {"uq_user_username"}),
+    "get_by_email": (select_user_by_email("Plan@Example.com"), {"ix_user_email_lower"}),
+    "get_by_oid": (select_user_by_oid(SAMPLE_OID), {"pk_user"}),
+    "get_users_page": (select_users_page(SAMPLE_OID, 50), {"pk_user"}),
+    "get_existing_usernames_and_emails": (
+        select_existing_usernames_and_emails(["plan"], ["plan@example.com"]),
+        {"uq_user_username", "ix_user_email_lower"},
+    ),
+    "update": (update_user(SAMPLE_USER), {"pk_user"}),
+    "delete": (delete_user(SAMPLE_OID), {"pk_user"}),
+}
+
+
+def walk(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+async def check() -> list[str]:
+    failures = []
+    database = Database()
+    async with database.get_write_and_read_session() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        dialect = session.get_bind().dialect
+        for name, (statement, indexes) in HOT_QUERIES.items():
+            result = await session.scalar(explain(statement, dialect))
+            plan = json.loads(result) if isinstance(result, str) else result
+            nodes = list(walk(plan[0]["Plan"]))
+            used = {node["Index Name"] for node in nodes if "Index Name" in node}
+            seq_scans = [
+                node
+                for node in nodes
+                if node["Node Type"] == "Seq Scan"
+                and node.get("Relation Name") == UserORM.__tablename__
+            ]
+            status = "ok"
+            if seq_scans:
+                status = "seq scan"
+            elif not indexes <= used:
+                status = f"expected {sorted(indexes)}, used {sorted(used)}"
+            print(f"{name:<36} {status}")
+            if status != "ok":
+                failures.append(name)
+        await session.rollback()
+    for engine in database.engines:
+        await engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(check()) else 0)
@@ -0,0 +1,102 @@
+"""Cost of turning a page of users into a response body.
+
+Compares FastAPI's default path for a pydantic ``response_model`` (build the
+model, dump it, validate it again, serialize in JSON mode, ``json.dumps``)
+with the msgspec view the user routes return, and reports gzip and brotli
+sizes and times for the msgspec body.
+
+    python -m benchmarks.serialization --sizes 1 100 10000
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+
+from pydantic import TypeAdapter
+
+from src.api.responses import MsgspecJSONResponse
+from src.api.v1.user.schemas import UserOut, UserPageOut, UserPageView
+from src.domain.base.pagination import Page
+from src.domain.user.entities import User
+from src.helper.compression import CompressionMiddleware, brotli_module
+
+PAGE_ADAPTER = TypeAdapter(UserPageOut)
+
+
+def make_page(size: int) -> Page[User]:
+    now = datetime.now(UTC)
+    users = [
+        User(
+            oid=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+            email=f"user{index}@example.com",
+            username=f"user{index}",
+            password="$2b$12$" + "x" * 53,
+            is_active=True,
+        )
+        for index in range(size)
+    ]
+    return Page(items=users, next_cursor="AZJ8d2Xc7k6Yq3pLmN0bVg")
+
+
+def pydantic_body(page: Page[User]) -> bytes:
+    model = UserPageOut(
+        items=[
+            UserOut.model_validate(user, from_attributes=True) for user in page.items
+        ],
+        next_cursor=page.next_cursor,
+    )
+    value = PAGE_ADAPTER.validate_python(model.model_dump(by_alias=True))
+    content = PAGE_ADAPTER.dump_python(value, mode="json", by_alias=True)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def msgspec_body(page: Page[User]) -> bytes:
+    return MsgspecJSONResponse(UserPageView.from_entity(page)).body
+
+
+def per_call(function: Callable[[], object], budget_seconds: float = 0.5) -> float:
+    function()
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < budget_seconds:
+        function()
+        calls += 1
+    return elapsed / calls
+
+
+def main(sizes: list[int]) -> None:
+    middleware = CompressionMiddleware(app=None)
+    encodings = ["gzip"] + (["br"] if brotli_module() is not None else [])
+    for size in sizes:
+        page = make_page(size)
+        assert json.loads(pydantic_body(page)) == json.loads(msgspec_body(page))
+        before = per_call(partial(pydantic_body, page))
+        after = per_call(partial(msgspec_body, page))
+        body = msgspec_body(page)
+        print(
+            f"users={size:<6} bytes={len(body):<9,} pydantic={before * 1e6:,.0f}us "
+            f"msgspec={after * 1e6:,.0f}us speedup={before / after:.1f}x"
+        )
+        for encoding in encodings:
+            compress = partial(middleware.compress, body, encoding)
+            compressed = compress()
+            took = per_call(compress)
+            print(
+                f"  {encoding:<4} bytes={len(compressed):<9,} "
+                f"ratio={len(body) / len(compressed):.1f} time={took * 1e6:,.0f}us"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    args = parser.parse_args()
+    main(args.sizes)
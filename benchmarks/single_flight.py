@@ -0,0 +1,60 @@
+"""Queries issued and caller latency for a burst of identical lookups.
+
+Simulates ``--callers`` concurrent lookups of one hot key against a query
+taking ``--query-ms``, directly and through ``SingleFlight``, while at most
+``--pool-size`` queries run at once like on a connection pool.
+
+    python -m benchmarks.single_flight --callers 1000 --query-ms 2 --pool-size 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from src.helper.single_flight import SingleFlight
+
+
+async def burst(lookup: Callable[[], Awaitable[object]], callers: int) -> list[float]:
+    async def timed() -> float:
+        started = time.perf_counter()
+        await lookup()
+        return time.perf_counter() - started
+
+    return await asyncio.gather(*(timed() for _ in range(callers)))
+
+
+async def main(callers: int, query_ms: float, pool_size: int) -> None:
+    pool = asyncio.Semaphore(pool_size)
+    queries = 0
+
+    async def query() -> object:
+        nonlocal queries
+        async with pool:
+            queries += 1
+            await asyncio.sleep(query_ms / 1000)
+            return object()
+
+    flights: SingleFlight[tuple[str, int], object] = SingleFlight()
+    for name, lookup in (
+        ("direct", query),
+        ("single-flight", lambda: flights.do(("oid", 1), query)),
+    ):
+        queries = 0
+        latencies = sorted(await burst(lookup, callers))
+        print(
+            f"{name:<14} queries={queries:<6} "
+            f"p50={statistics.median(latencies) * 1000:.1f}ms "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms"
+        )
+    print(flights.stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=1000)
+    parser.add_argument("--query-ms", type=float, default=2.0)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.callers, args.query_ms, args.pool_size))
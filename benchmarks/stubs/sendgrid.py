@@ -0,0 +1,83 @@
+"""Local stand-in for the SendGrid v3 mail send endpoint.
+
+Accepts what the real API accepts, answers 202 after ``latency`` seconds and
+fails ``failure_rate`` of requests with 503 to exercise retries. Point
+SENDGRID_API_URL at it:
+
+    python -m benchmarks.stubs.sendgrid --port 8025 --latency 0.2
+    SENDGRID_API_URL=http://127.0.0.1:8025/v3/mail/send
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    failures: int = 0
+    emails: int = 0
+
+
+def create_app(latency: float, failure_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.state.stats = StubStats()
+
+    @app.post("/v3/mail/send")
+    async def send(request: Request) -> Response:
+        stats: StubStats = app.state.stats
+        payload = await request.json()
+        await asyncio.sleep(latency)
+        stats.requests += 1
+        if random.random() < failure_rate:
+            stats.failures += 1
+            return Response(status_code=503)
+        personalizations = payload.get("personalizations") or []
+        if not 1 <= len(personalizations) <= 1000:
+            return Response(status_code=400)
+        stats.emails += len(personalizations)
+        return Response(status_code=202)
+
+    return app
+
+
+class StubServer:
+    """Runs the stub on its own thread and event loop, so even blocking
+    clients on the caller's loop can reach it"""
+
+    def __init__(self, port: int, latency: float, failure_rate: float) -> None:
+        self.app = create_app(latency, failure_rate)
+        self.url = f"http://127.0.0.1:{port}/v3/mail/send"
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def stats(self) -> StubStats:
+        return self.app.state.stats
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            threading.Event().wait(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.failure_rate), port=args.port)
@@ -0,0 +1,50 @@
+"""Bloom filter memory and false positive rate for the token revocation list.
+
+python -m benchmarks.token_revocation --revoked 1000000 --probes 1000000
+"""
+
+import argparse
+import sys
+import time
+
+from src.helper.bloom import BloomFilter
+from src.helper.uuid import uuid7
+
+
+def main(revoked: int, probes: int, error_rate: float) -> None:
+    bloom = BloomFilter(revoked, error_rate)
+    jtis = [str(uuid7()).encode() for _ in range(revoked)]
+    started = time.perf_counter()
+    for jti in jtis:
+        bloom.add(jti)
+    added = revoked / (time.perf_counter() - started)
+
+    # the same revocations held as an exact set, for comparison
+    exact = set(jtis)
+    exact_bytes = sys.getsizeof(exact) + sum(sys.getsizeof(jti) for jti in jtis)
+
+    candidates = [str(uuid7()).encode() for _ in range(probes)]
+    started = time.perf_counter()
+    false_positives = sum(1 for jti in candidates if jti in bloom)
+    checked = probes / (time.perf_counter() - started)
+    assert all(jti in bloom for jti in jtis[:10_000]), "false negative"
+
+    per_million = bloom.size_in_bytes * 1_000_000 / revoked
+    print(f"revoked={revoked} bits={bloom.num_bits} hashes={bloom.num_hashes}")
+    print(f"bloom memory={bloom.size_in_bytes / 2**20:.2f} MiB")
+    print(f"bloom memory per million revoked={per_million / 2**20:.2f} MiB")
+    print(f"exact set memory={exact_bytes / 2**20:.2f} MiB")
+    print(
+        f"false positive rate measured={false_positives / probes:.5f}"
+        f" expected={bloom.false_positive_rate:.5f} target={error_rate}"
+    )
+    print(f"adds/s={added:.0f} checks/s={checked:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--revoked", type=int, default=1_000_000)
+    parser.add_argument("--probes", type=int, default=1_000_000)
+    parser.add_argument("--error-rate", type=float, default=0.001)
+    args = parser.parse_args()
+    main(args.revoked, args.probes, args.error_rate)
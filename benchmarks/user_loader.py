@@ -0,0 +1,82 @@
+"""Query count and latency of resolving N users by oid, one query per oid vs
+batched through ``BatchLoader``.
+
+The database is simulated: a query costs ``--query-ms`` plus ``--row-us`` per
+row returned, and at most ``--pool-size`` queries run at once like on a
+connection pool.
+
+    python -m benchmarks.user_loader --sizes 1 10 100 1000 --max-batch-size 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from src.helper.batch_loader import BatchLoader
+
+
+class Database:
+    def __init__(self, query_ms: float, row_us: float, pool_size: int) -> None:
+        self.query_seconds = query_ms / 1000
+        self.row_seconds = row_us / 1_000_000
+        self.pool = asyncio.Semaphore(pool_size)
+        self.queries = 0
+
+    async def select(self, oids: list[uuid.UUID]) -> dict[uuid.UUID, uuid.UUID]:
+        async with self.pool:
+            self.queries += 1
+            await asyncio.sleep(self.query_seconds + self.row_seconds * len(oids))
+            return {oid: oid for oid in oids}
+
+    async def select_one(self, oid: uuid.UUID) -> uuid.UUID | None:
+        return (await self.select([oid])).get(oid)
+
+
+async def measure(
+    database: Database, oids: list[uuid.UUID], batched: bool, max_batch_size: int
+) -> tuple[int, float]:
+    database.queries = 0
+    started = time.perf_counter()
+    if batched:
+        loader = BatchLoader(database.select, max_batch_size)
+        users = await loader.load_many(oids)
+    else:
+        users = await asyncio.gather(*(database.select_one(oid) for oid in oids))
+    elapsed = time.perf_counter() - started
+    assert users == oids
+    return database.queries, elapsed
+
+
+async def main(
+    sizes: list[int],
+    max_batch_size: int,
+    query_ms: float,
+    row_us: float,
+    pool_size: int,
+) -> None:
+    database = Database(query_ms, row_us, pool_size)
+    for size in sizes:
+        oids = [uuid.uuid4() for _ in range(size)]
+        per_oid = await measure(database, oids, False, max_batch_size)
+        batched = await measure(database, oids, True, max_batch_size)
+        print(
+            f"n={size:<5} per-oid queries={per_oid[0]:<5} "
+            f"latency={per_oid[1] * 1000:.1f}ms  "
+            f"batched queries={batched[0]:<3} latency={batched[1] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--max-batch-size", type=int, default=500)
+    parser.add_argument("--query-ms", type=float, default=1.0)
+    parser.add_argument("--row-us", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.sizes, args.max_batch_size, args.query_ms, args.row_us, args.pool_size
+        )
+    )
@@ -0,0 +1,84 @@
+"""Rows/s and memory of reading users, ORM instances vs Core rows into entities.
+
+Materialisation cost does not depend on the server, so this reads from an
+in-memory SQLite copy of the user table through the same select builders the
+repository uses.
+
+    python -m benchmarks.user_read_path --users 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.domain.user.entities import User
+from src.infrastructure.postgresql.models.user import UserORM
+from src.infrastructure.postgresql.queries.user import select_users
+
+
+def read_orm(engine) -> list[User]:
+    with Session(engine) as session:
+        return [user.to_entity() for user in session.scalars(select_users(orm=True))]
+
+
+def read_core(engine) -> list[User]:
+    with engine.connect() as connection:
+        return [User(*row) for row in connection.execute(select_users())]
+
+
+def measure(name: str, read: Callable, engine, users: int) -> None:
+    read(engine)  # warm the statement cache
+    gc.collect()
+    started = time.perf_counter()
+    read(engine)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    result = read(engine)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result) == users
+    per_100k = 100_000 / users / 2**20
+    print(
+        f"{name:<4} rows/s={users / elapsed:,.0f} "
+        f"peak={peak * per_100k:.1f}MiB retained={retained * per_100k:.1f}MiB"
+        " per 100k users"
+    )
+
+
+def main(users: int) -> None:
+    engine = create_engine("sqlite://")
+    UserORM.__table__.create(engine)
+    now = datetime.now(UTC)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(UserORM.__table__),
+            [
+                {
+                    "oid": uuid.uuid4(),
+                    "email": f"user{index}@example.com",
+                    "username": f"user{index}",
+                    "password": "$2b$12$" + "x" * 53,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(users)
+            ],
+        )
+    measure("orm", read_orm, engine, users)
+    measure("core", read_core, engine, users)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.users)
@@ -0,0 +1,83 @@
+"""Insert throughput into a uuid primary key, uuid4 vs uuid7.
+
+Rows are COPYed in batches into a scratch table per version; throughput is
+reported per slice of the run, so the slowdown of random inserts once the
+primary key index outgrows shared_buffers shows up, together with the final
+index size. Needs the Postgres configured in .env.
+
+    python -m benchmarks.uuid_inserts --rows 5000000 --batch-size 50000
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.helper.uuid import uuid7
+from src.infrastructure.postgresql.database import Database
+
+
+async def insert(
+    engine: AsyncEngine,
+    name: str,
+    generate: Callable[[], UUID],
+    rows: int,
+    batch_size: int,
+    slices: int,
+) -> None:
+    table = f"bench_uuid_{name}"
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        await driver.execute(f"DROP TABLE IF EXISTS {table}")
+        await driver.execute(
+            f"CREATE TABLE {table} (oid uuid PRIMARY KEY, payload text NOT NULL)"
+        )
+        print(name)
+        inserted = slice_rows = 0
+        slice_size = max(rows // slices, batch_size)
+        slice_started = started = time.perf_counter()
+        while inserted < rows:
+            count = min(batch_size, rows - inserted)
+            records = [(generate(), "x" * 32) for _ in range(count)]
+            await driver.copy_records_to_table(
+                table, records=records, columns=["oid", "payload"]
+            )
+            inserted += count
+            slice_rows += count
+            if slice_rows >= slice_size or inserted == rows:
+                now = time.perf_counter()
+                print(
+                    f"  rows={inserted:>10} "
+                    f"slice rows/s={slice_rows / (now - slice_started):>10.0f}"
+                )
+                slice_rows = 0
+                slice_started = now
+        elapsed = time.perf_counter() - started
+        index_size = await driver.fetchval(
+            f"SELECT pg_size_pretty(pg_relation_size('{table}_pkey'))"
+        )
+        print(f"  total rows/s={rows / elapsed:.0f} pk index={index_size}")
+        await driver.execute(f"DROP TABLE {table}")
+
+
+async def main(rows: int, batch_size: int, slices: int) -> None:
+    database = Database()
+    engine = database.engines[0]
+    try:
+        await insert(engine, "v4", uuid4, rows, batch_size, slices)
+        await insert(engine, "v7", uuid7, rows, batch_size, slices)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--slices", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size, args.slices))
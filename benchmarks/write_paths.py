@@ -0,0 +1,111 @@
+"""Round trips and latency of user writes, old ORM paths vs single statements.
+
+The old paths are reproduced here (add/commit/refresh, merge/commit/refresh and
+SELECT-then-DELETE plus the SELECT RegisterUserUseCase used to do). Needs the
+Postgres configured in .env with migrations applied.
+
+    python -m benchmarks.write_paths --iterations 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+
+from sqlalchemy import delete, event, select
+
+from benchmarks.common import summarize
+from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.models.user import UserORM
+from src.infrastructure.postgresql.repositories.user import PostgresUserRepository
+
+
+class LegacyUserRepository(PostgresUserRepository):
+    async def create(self, user: UserORM) -> UserORM:
+        async with self.database.get_read_only_session() as session:
+            await session.scalar(
+                select(UserORM).where(UserORM.username == user.username).limit(1)
+            )
+        async with self.database.get_write_and_read_session() as session:
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
+            return user
+
+    async def update(self, user: UserORM) -> UserORM:
+        async with self.database.get_write_and_read_session() as session:
+            user = await session.merge(user)
+            await session.commit()
+            await session.refresh(user)
+            return user
+
+    async def delete(self, oid: str) -> UserORM:
+        async with self.database.get_read_only_session() as session:
+            user = await session.scalar(select(UserORM).where(UserORM.oid == oid))
+        async with self.database.get_write_and_read_session() as session:
+            await session.execute(delete(UserORM).where(UserORM.oid == oid))
+            await session.commit()
+        return user
+
+
+def count_round_trips(database: Database, counter: dict[str, int]) -> None:
+    def on_statement(*args) -> None:
+        counter["round_trips"] += 1
+
+    for engine in database.engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", on_statement)
+        event.listen(engine.sync_engine, "commit", on_statement)
+
+
+async def run(
+    name: str, repository: PostgresUserRepository, counter: dict, iterations: int
+) -> None:
+    latencies = defaultdict(list)
+    trips = defaultdict(int)
+
+    async def measure(operation: str, coroutine):
+        before = counter["round_trips"]
+        started = time.perf_counter()
+        result = await coroutine
+        latencies[operation].append(time.perf_counter() - started)
+        trips[operation] += counter["round_trips"] - before
+        return result
+
+    for _ in range(iterations):
+        suffix = uuid.uuid4().hex[:12]
+        user = UserORM(
+            email=f"bench-{suffix}@example.com",
+            username=f"bench-{suffix}",
+            password="x" * 60,
+        )
+        user = await measure("create", repository.create(user))
+        user = UserORM(
+            oid=user.oid,
+            email=user.email,
+            username=user.username,
+            password="y" * 60,
+        )
+        await measure("update", repository.update(user))
+        await measure("delete", repository.delete(user.oid))
+
+    print(name)
+    for operation, values in latencies.items():
+        print(
+            f"  {operation:<6} round_trips/op={trips[operation] / iterations:.1f} "
+            f"{summarize(values)}"
+        )
+
+
+async def main(iterations: int) -> None:
+    database = Database()
+    counter = {"round_trips": 0}
+    count_round_trips(database, counter)
+    await run("before", LegacyUserRepository(database), counter, iterations)
+    await run("after", PostgresUserRepository(database), counter, iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    asyncio.run(main(parser.parse_args().iterations))
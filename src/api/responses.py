@@ -0,0 +1,18 @@
+from typing import Any
+
+import msgspec
+from fastapi.responses import JSONResponse
+
+ENCODER = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response encoded by msgspec.
+
+    Structs, dataclasses, UUIDs and datetimes are encoded natively. Routes that
+    return the response themselves also skip FastAPI's response_model
+    validation and jsonable_encoder pass, which dominate on large listings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return ENCODER.encode(content)
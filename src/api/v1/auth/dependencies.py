@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.core.config.containers import get_container
+from src.domain.user.errors import TokenInvalidException
+from src.domain.user.services import ITokenRevocationService, ITokenService
+from src.domain.user.value_objects import TokenClaims
+from src.helper.errors import fail
+
+bearer = HTTPBearer(auto_error=False)
+
+
+async def get_token_claims(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer)],
+) -> TokenClaims:
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    container = get_container()
+    token_service: ITokenService = container.resolve(ITokenService)
+    claims = token_service.verify_token(credentials.credentials)
+    revocation: ITokenRevocationService = container.resolve(ITokenRevocationService)
+    if await revocation.is_revoked(claims):
+        fail(TokenInvalidException("The token has been revoked. Please login again"))
+    return claims
+
+
+CurrentTokenClaims = Annotated[TokenClaims, Depends(get_token_claims)]
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, status
+
+from src.api.v1.auth.dependencies import CurrentTokenClaims
+from src.api.v1.auth.schemas import LoginIn, LogoutIn, RefreshIn, TokenPairOut
+from src.api.v1.dependencies import LoginUser, LogoutUser, RefreshToken
+from src.domain.user.commands import (
+    LoginUserCommand,
+    LogoutUserCommand,
+    RefreshTokenCommand,
+)
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/login", response_model=TokenPairOut)
+async def login(body: LoginIn, use_case: LoginUser) -> TokenPairOut:
+    token_pair = await use_case.execute(
+        LoginUserCommand(
+            password=body.password, email=body.email, username=body.username
+        )
+    )
+    return TokenPairOut.from_entity(token_pair)
+
+
+@router.post("/refresh", response_model=TokenPairOut)
+async def refresh(body: RefreshIn, use_case: RefreshToken) -> TokenPairOut:
+    token_pair = await use_case.execute(
+        RefreshTokenCommand(refresh_token=body.refresh_token)
+    )
+    return TokenPairOut.from_entity(token_pair)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    claims: CurrentTokenClaims, use_case: LogoutUser, body: LogoutIn | None = None
+) -> None:
+    await use_case.execute(
+        LogoutUserCommand(
+            claims=claims, refresh_token=body.refresh_token if body else None
+        )
+    )
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, model_validator
+
+from src.domain.user.value_objects import TokenPair
+
+
+class LoginIn(BaseModel):
+    username: str | None = None
+    email: str | None = None
+    password: str
+
+    @model_validator(mode="after")
+    def check_username_or_email(self) -> "LoginIn":
+        if not (self.username or self.email):
+            raise ValueError("username or email is required")
+        return self
+
+
+class RefreshIn(BaseModel):
+    refresh_token: str
+
+
+class LogoutIn(BaseModel):
+    refresh_token: str | None = None
+
+
+class TokenPairOut(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
+
+    @staticmethod
+    def from_entity(token_pair: TokenPair) -> "TokenPairOut":
+        return TokenPairOut(
+            access_token=token_pair.access_token,
+            refresh_token=token_pair.refresh_token,
+            token_type=token_pair.token_type,
+        )
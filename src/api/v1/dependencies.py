@@ -0,0 +1,41 @@
+from collections.abc import Awaitable, Callable
+from typing import Annotated, TypeVar
+
+from fastapi import Depends
+
+from src.core.config.containers import get_container
+from src.domain.user.use_cases import (
+    ChangePasswordUseCase,
+    ForgetPasswordUseCase,
+    GetListUserUseCase,
+    GetUserUseCase,
+    LoginUserUseCase,
+    LogoutUserUseCase,
+    RefreshTokenUseCase,
+    RegisterUserUseCase,
+)
+
+T = TypeVar("T")
+
+
+def provide(service: type[T]) -> Callable[[], Awaitable[T]]:
+    # async so FastAPI calls it on the event loop, sync dependencies go through
+    # the threadpool
+    async def dependency() -> T:
+        return get_container().resolve(service)
+
+    return dependency
+
+
+RegisterUser = Annotated[RegisterUserUseCase, Depends(provide(RegisterUserUseCase))]
+LoginUser = Annotated[LoginUserUseCase, Depends(provide(LoginUserUseCase))]
+RefreshToken = Annotated[RefreshTokenUseCase, Depends(provide(RefreshTokenUseCase))]
+LogoutUser = Annotated[LogoutUserUseCase, Depends(provide(LogoutUserUseCase))]
+GetUser = Annotated[GetUserUseCase, Depends(provide(GetUserUseCase))]
+GetListUser = Annotated[GetListUserUseCase, Depends(provide(GetListUserUseCase))]
+ChangePassword = Annotated[
+    ChangePasswordUseCase, Depends(provide(ChangePasswordUseCase))
+]
+ForgetPassword = Annotated[
+    ForgetPasswordUseCase, Depends(provide(ForgetPasswordUseCase))
+]
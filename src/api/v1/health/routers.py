@@ -0,0 +1,49 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from src.core.config.containers import get_container
+from src.domain.user.services import ITokenRevocationService
+from src.infrastructure.cache.user import CachedUserRepository
+from src.infrastructure.email.dispatcher import (
+    IEmailDispatcher,
+    SendGridEmailDispatcher,
+)
+from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.repositories.user import IUserRepository
+from src.service.hashing import PasswordHashingPool
+from src.service.user import TokenRevocationService
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("")
+async def health() -> dict:
+    container = get_container()
+    pool: PasswordHashingPool = container.resolve(PasswordHashingPool)
+    database: Database = container.resolve(Database)
+    repository: IUserRepository = container.resolve(IUserRepository)
+    revocation: ITokenRevocationService = container.resolve(ITokenRevocationService)
+    dispatcher: IEmailDispatcher = container.resolve(IEmailDispatcher)
+    return {
+        "status": "ok",
+        "password_hashing": asdict(pool.stats),
+        "database_pools": {
+            name: asdict(stats) for name, stats in database.pool_stats().items()
+        },
+        "user_cache": (
+            asdict(repository.stats)
+            if isinstance(repository, CachedUserRepository)
+            else None
+        ),
+        "token_revocation": (
+            asdict(revocation.stats)
+            if isinstance(revocation, TokenRevocationService)
+            else None
+        ),
+        "email_dispatch": (
+            asdict(dispatcher.stats)
+            if isinstance(dispatcher, SendGridEmailDispatcher)
+            else None
+        ),
+    }
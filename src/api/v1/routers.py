@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from src.api.v1.auth.routers import router as auth_router
+from src.api.v1.health.routers import router as health_router
+from src.api.v1.user.routers import router as user_router
+
+router = APIRouter(prefix="/api/v1")
+router.include_router(health_router)
+router.include_router(auth_router)
+router.include_router(user_router)
@@ -0,0 +1,60 @@
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+
+from src.api.responses import ENCODER, MsgspecJSONResponse
+from src.api.v1.auth.dependencies import CurrentTokenClaims
+from src.api.v1.dependencies import GetListUser, GetUser, RegisterUser
+from src.api.v1.user.schemas import (
+    RegisterIn,
+    UserOut,
+    UserPageOut,
+    UserPageView,
+    UserView,
+)
+from src.domain.user.commands import (
+    GetListUserCommand,
+    GetUserCommand,
+    RegisterUserCommand,
+)
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.post("", response_model=UserOut, status_code=status.HTTP_201_CREATED)
+async def register_user(
+    body: RegisterIn, use_case: RegisterUser
+) -> MsgspecJSONResponse:
+    user = await use_case.execute(RegisterUserCommand(user=body.to_entity()))
+    return MsgspecJSONResponse(
+        UserView.from_entity(user), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.get("", response_model=UserPageOut)
+async def get_list_user(
+    claims: CurrentTokenClaims,
+    use_case: GetListUser,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1),
+) -> MsgspecJSONResponse:
+    page = await use_case.execute(GetListUserCommand(cursor=cursor, limit=limit))
+    return MsgspecJSONResponse(UserPageView.from_entity(page))
+
+
+@router.get("/me", response_model=UserOut)
+async def get_me(claims: CurrentTokenClaims, use_case: GetUser) -> MsgspecJSONResponse:
+    user = await use_case.execute(GetUserCommand(oid=claims.sub))
+    return MsgspecJSONResponse(UserView.from_entity(user))
+
+
+@router.get("/stream")
+async def stream_users(
+    claims: CurrentTokenClaims, use_case: GetListUser
+) -> StreamingResponse:
+    async def lines() -> AsyncIterator[bytes]:
+        async for user in use_case.stream():
+            yield ENCODER.encode(UserView.from_entity(user)) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
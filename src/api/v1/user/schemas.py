@@ -0,0 +1,72 @@
+from datetime import datetime
+from uuid import UUID
+
+import msgspec
+from pydantic import BaseModel
+
+from src.domain.base.pagination import Page
+from src.domain.user.entities import User
+
+
+class RegisterIn(BaseModel):
+    email: str
+    username: str
+    password: str
+
+    def to_entity(self) -> User:
+        return User(
+            oid=None,
+            created_at=None,
+            updated_at=None,
+            email=self.email,
+            username=self.username,
+            password=self.password,
+        )
+
+
+class UserOut(BaseModel):
+    """OpenAPI schema of UserView, responses are encoded from the view."""
+
+    oid: UUID
+    email: str
+    username: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class UserPageOut(BaseModel):
+    items: list[UserOut]
+    next_cursor: str | None
+
+
+class UserView(msgspec.Struct, frozen=True, gc=False):
+    oid: UUID
+    email: str
+    username: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @staticmethod
+    def from_entity(entity: User) -> "UserView":
+        return UserView(
+            oid=entity.oid,
+            email=entity.email,
+            username=entity.username,
+            is_active=entity.is_active,
+            created_at=entity.created_at,
+            updated_at=entity.updated_at,
+        )
+
+
+class UserPageView(msgspec.Struct, frozen=True):
+    items: list[UserView]
+    next_cursor: str | None
+
+    @staticmethod
+    def from_entity(page: Page[User]) -> "UserPageView":
+        return UserPageView(
+            items=[UserView.from_entity(user) for user in page.items],
+            next_cursor=page.next_cursor,
+        )
@@ -0,0 +1,69 @@
+"""Register users in bulk from a CSV file with email, username and password columns.
+
+    python -m src.cli.import_users users.csv --batch-size 10000
+
+Conflicts are printed one per line (tab separated), followed by a summary.
+"""
+
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from itertools import batched
+
+from src.core.config.containers import get_container
+from src.domain.user.commands import BulkRegisterUserCommand
+from src.domain.user.entities import User
+from src.domain.user.use_cases import BulkRegisterUserUseCase
+from src.service.hashing import PasswordHashingPool
+
+
+async def import_users(path: str, batch_size: int) -> None:
+    container = get_container()
+    use_case: BulkRegisterUserUseCase = container.resolve(BulkRegisterUserUseCase)
+    pool: PasswordHashingPool = container.resolve(PasswordHashingPool)
+    created = conflicts = 0
+    started = time.perf_counter()
+    try:
+        with open(path, newline="") as file:
+            for rows in batched(csv.DictReader(file), batch_size):
+                users = [
+                    User(
+                        oid=None,
+                        created_at=None,
+                        updated_at=None,
+                        email=row["email"],
+                        username=row["username"],
+                        password=row["password"],
+                    )
+                    for row in rows
+                ]
+                result = await use_case.execute(BulkRegisterUserCommand(users=users))
+                for conflict in result.conflicts:
+                    print(
+                        f"{conflict.username}\t{conflict.email}\t{conflict.reason}",
+                        file=sys.stderr,
+                    )
+                created += result.created
+                conflicts += len(result.conflicts)
+                print(
+                    f"batch: created={result.created} "
+                    f"conflicts={len(result.conflicts)} "
+                    f"rows/s={result.rows_per_second:.0f}"
+                )
+    finally:
+        pool.shutdown()
+    elapsed = time.perf_counter() - started
+    print(
+        f"total: created={created} conflicts={conflicts} "
+        f"elapsed={elapsed:.1f}s rows/s={(created + conflicts) / elapsed:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(import_users(args.path, args.batch_size))
@@ -2,14 +2,88 @@ from functools import lru_cache
 
 import punq
 
-from src.domain.user.services import ILoginService, IPasswordService, IUserService
-from src.domain.user.use_cases import LoginUserUseCase, RegisterUserUseCase
+from src.core.config.settings import get_settings
+from src.domain.user.services import (
+    ICodeService,
+    ILoginService,
+    IPasswordService,
+    IRefreshTokenService,
+    ISendCodeService,
+    ITokenRevocationService,
+    ITokenService,
+    IUserLoader,
+    IUserService,
+)
+from src.domain.user.use_cases import (
+    BulkRegisterUserUseCase,
+    ChangePasswordUseCase,
+    ForgetPasswordUseCase,
+    GetListUserUseCase,
+    GetUserUseCase,
+    LoginUserUseCase,
+    LogoutUserUseCase,
+    RefreshTokenUseCase,
+    RegisterUserUseCase,
+)
+from src.infrastructure.cache.code import (
+    ICodeStore,
+    InMemoryCodeStore,
+    RedisCodeStore,
+)
+from src.infrastructure.cache.user import (
+    CachedUserRepository,
+    SingleFlightUserRepository,
+)
+from src.infrastructure.email.dispatcher import (
+    IEmailDispatcher,
+    SendGridEmailDispatcher,
+)
 from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.repositories.refresh_token import (
+    IRefreshTokenRepository,
+    PostgresRefreshTokenRepository,
+)
+from src.infrastructure.postgresql.repositories.revoked_token import (
+    IRevokedTokenRepository,
+    PostgresRevokedTokenRepository,
+)
 from src.infrastructure.postgresql.repositories.user import (
     IUserRepository,
     PostgresUserRepository,
 )
-from src.service.user import LoginService, PasswordService, UserService
+from src.service.hashing import PasswordHashingPool
+from src.service.user import (
+    CodeService,
+    LoginService,
+    PasswordService,
+    RefreshTokenService,
+    SendCodeService,
+    TokenRevocationService,
+    TokenService,
+    UserLoader,
+    UserService,
+)
+
+USE_CASES = (
+    RegisterUserUseCase,
+    BulkRegisterUserUseCase,
+    LoginUserUseCase,
+    RefreshTokenUseCase,
+    LogoutUserUseCase,
+    GetUserUseCase,
+    GetListUserUseCase,
+    ChangePasswordUseCase,
+    ForgetPasswordUseCase,
+)
+# resolved outside of use cases, by the API layer and the lifespan
+ENTRY_POINTS = (
+    Database,
+    PasswordHashingPool,
+    ITokenService,
+    ITokenRevocationService,
+    IEmailDispatcher,
+    IUserLoader,
+)
 
 
 @lru_cache(1)
@@ -17,14 +91,137 @@ def get_container() -> punq.Container:
     return init_container()
 
 
-def init_container() -> punq.Container:
+def init_container(
+    user_cache: bool | None = None, precompiled: bool | None = None
+) -> punq.Container:
+    """With ``precompiled`` every stateless component is a singleton and the
+    graph is validated up front, so resolving a use case returns the instance
+    built at startup instead of rebuilding the same frozen dataclasses per
+    request.
+    """
+    settings = get_settings()
+    if precompiled is None:
+        precompiled = settings.CONTAINER_PRECOMPILED
+    stateless = punq.Scope.singleton if precompiled else punq.Scope.transient
     container = punq.Container()
-    container.register(Database, scope=punq.Scope.singleton)
-
-    container.register(IUserRepository, PostgresUserRepository)
-    container.register(IUserService, UserService)
-    container.register(ILoginService, LoginService)
-    container.register(IPasswordService, PasswordService)
-    container.register(RegisterUserUseCase)
-    container.register(LoginUserUseCase)
+    # a factory, so punq does not try to resolve the optional arguments
+    container.register(Database, factory=lambda: Database(), scope=punq.Scope.singleton)
+    container.register(
+        PasswordHashingPool,
+        factory=lambda: PasswordHashingPool(
+            max_workers=settings.PASSWORD_HASHING_POOL_SIZE,
+            max_queue_size=settings.PASSWORD_HASHING_MAX_QUEUE_SIZE,
+            max_wait_seconds=settings.PASSWORD_HASHING_MAX_WAIT_SECONDS,
+            rounds=settings.BCRYPT_ROUNDS,
+        ),
+        scope=punq.Scope.singleton,
+    )
+
+    if user_cache is None:
+        user_cache = settings.USER_CACHE_ENABLED
+    if user_cache or settings.USER_SINGLE_FLIGHT_ENABLED:
+
+        def user_repository() -> IUserRepository:
+            repository = container.resolve(PostgresUserRepository)
+            if settings.USER_SINGLE_FLIGHT_ENABLED:
+                repository = SingleFlightUserRepository(repository)
+            if user_cache:
+                repository = CachedUserRepository(
+                    repository=repository,
+                    max_size=settings.USER_CACHE_MAX_SIZE,
+                    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+                    stale_seconds=(
+                        settings.POSTGRES_REPLICA_MAX_LAG_SECONDS
+                        if settings.POSTGRES_REPLICA_URLS
+                        else 0.0
+                    ),
+                )
+            return repository
+
+        container.register(PostgresUserRepository, scope=stateless)
+        container.register(
+            IUserRepository, factory=user_repository, scope=punq.Scope.singleton
+        )
+    else:
+        container.register(IUserRepository, PostgresUserRepository, scope=stateless)
+    container.register(IUserService, UserService, scope=stateless)
+    # a new loader per resolve, FastAPI reuses it within one request
+    container.register(
+        IUserLoader,
+        factory=lambda: UserLoader(
+            user_service=container.resolve(IUserService),
+            max_batch_size=settings.USER_LOADER_MAX_BATCH_SIZE,
+        ),
+        scope=punq.Scope.transient,
+    )
+    container.register(
+        IRefreshTokenRepository, PostgresRefreshTokenRepository, scope=stateless
+    )
+    container.register(ILoginService, LoginService, scope=stateless)
+    container.register(IRefreshTokenService, RefreshTokenService, scope=stateless)
+    container.register(
+        ITokenService,
+        factory=lambda: TokenService(
+            secret_key=settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+            max_size=settings.TOKEN_CACHE_MAX_SIZE,
+        ),
+        scope=punq.Scope.singleton,
+    )
+    container.register(
+        IRevokedTokenRepository, PostgresRevokedTokenRepository, scope=stateless
+    )
+    container.register(
+        ITokenRevocationService,
+        factory=lambda: TokenRevocationService(
+            repository=container.resolve(IRevokedTokenRepository),
+            capacity=settings.TOKEN_REVOCATION_CAPACITY,
+            error_rate=settings.TOKEN_REVOCATION_ERROR_RATE,
+            refresh_interval=settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+            rebuild_interval=settings.TOKEN_REVOCATION_REBUILD_SECONDS,
+        ),
+        scope=punq.Scope.singleton,
+    )
+    container.register(IPasswordService, PasswordService, scope=stateless)
+    if settings.CODE_STORE == "redis":
+        container.register(
+            ICodeStore,
+            factory=lambda: RedisCodeStore.from_url(settings.REDIS_URL),
+            scope=punq.Scope.singleton,
+        )
+    else:
+        container.register(
+            ICodeStore,
+            factory=lambda: InMemoryCodeStore(max_size=settings.CODE_STORE_MAX_SIZE),
+            scope=punq.Scope.singleton,
+        )
+    container.register(ICodeService, CodeService, scope=stateless)
+    container.register(
+        IEmailDispatcher,
+        factory=lambda: SendGridEmailDispatcher(
+            api_key=settings.SENDGRID_KEY,
+            from_email=settings.FROM_EMAIL,
+            api_url=settings.SENDGRID_API_URL,
+            max_queue_size=settings.EMAIL_QUEUE_MAX_SIZE,
+            max_batch_size=settings.EMAIL_BATCH_MAX_SIZE,
+            max_retries=settings.EMAIL_MAX_RETRIES,
+            backoff_seconds=settings.EMAIL_RETRY_BACKOFF_SECONDS,
+            timeout=settings.EMAIL_TIMEOUT_SECONDS,
+        ),
+        scope=punq.Scope.singleton,
+    )
+    container.register(ISendCodeService, SendCodeService, scope=stateless)
+    for use_case in USE_CASES:
+        container.register(use_case, scope=stateless)
+    if precompiled:
+        validate_container(container)
     return container
+
+
+def validate_container(container: punq.Container) -> None:
+    """Resolve every entry point so a broken graph fails at startup"""
+    for service in (*USE_CASES, *ENTRY_POINTS):
+        try:
+            container.resolve(service)
+        except Exception as exc:
+            raise RuntimeError(f"Can not resolve {service.__name__}") from exc
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -9,18 +10,71 @@ class Settings(BaseSettings):
         case_sensitive=True,
     )
 
+    DEBUG: bool = False
+    METRICS_ENABLED: bool = True
+    CONTAINER_PRECOMPILED: bool = True
+    RESPONSE_COMPRESSION_ENABLED: bool = False
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024
+
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: str
     POSTGRES_DB: str
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_POOL_MAX_OVERFLOW: int = 5
+    POSTGRES_POOL_TIMEOUT: float = 10.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_WARM_UP_CONNECTIONS: int = 5
+    POSTGRES_READ_ONLY_SHARE_POOL: bool = True
+    POSTGRES_REPLICA_URLS: list[str] = []
+    POSTGRES_REPLICA_BALANCING: Literal["round_robin", "least_connections"] = (
+        "round_robin"
+    )
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
 
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 3600
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 100_000
+    TOKEN_REVOCATION_CAPACITY: int = 1_000_000
+    TOKEN_REVOCATION_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    TOKEN_REVOCATION_REBUILD_SECONDS: float = 3600.0
 
     SENDGRID_KEY: str
+    SENDGRID_API_URL: str = "https://api.sendgrid.com/v3/mail/send"
     FROM_EMAIL: str
+    EMAIL_QUEUE_MAX_SIZE: int = 10_000
+    EMAIL_BATCH_MAX_SIZE: int = 1000
+    EMAIL_MAX_RETRIES: int = 5
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 0.5
+    EMAIL_TIMEOUT_SECONDS: float = 10.0
+
+    PASSWORD_HASHING_POOL_SIZE: int | None = None
+    PASSWORD_HASHING_MAX_QUEUE_SIZE: int = 256
+    PASSWORD_HASHING_MAX_WAIT_SECONDS: float = 2.0
+    BCRYPT_ROUNDS: int | None = None
+    BCRYPT_TARGET_VERIFY_SECONDS: float | None = None
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+
+    USER_PAGE_SIZE_DEFAULT: int = 50
+    USER_PAGE_SIZE_MAX: int = 500
+    USER_STREAM_BATCH_SIZE: int = 1000
+    USER_READ_MODE: Literal["core", "orm"] = "core"
+    USER_CACHE_ENABLED: bool = False
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_SINGLE_FLIGHT_ENABLED: bool = True
+    USER_LOADER_MAX_BATCH_SIZE: int = 500
+
+    CODE_STORE: Literal["memory", "redis"] = "memory"
+    CODE_STORE_MAX_SIZE: int = 100_000
+    REDIS_URL: str = "redis://localhost:6379/0"
 
     @property
     def POSTGRES_URL(self) -> str:
@@ -30,6 +84,3 @@ class Settings(BaseSettings):
 @lru_cache(1)
 def get_settings() -> Settings:
     return Settings()
-
-
-settings = Settings()
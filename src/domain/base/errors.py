@@ -1,2 +1,6 @@
 class BaseDomainException(Exception):
     pass
+
+
+class InvalidCursorException(BaseDomainException):
+    pass
@@ -0,0 +1,27 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from src.domain.base.errors import InvalidCursorException
+from src.helper.errors import fail
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(oid: UUID) -> str:
+    return base64.urlsafe_b64encode(oid.bytes).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> UUID:
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        fail(InvalidCursorException("Invalid cursor. Please use next_cursor as is"))
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-
-from sqlalchemy import UUID
+from uuid import UUID
 
 from src.domain.user.entities import User
+from src.domain.user.value_objects import TokenClaims
 
 
 @dataclass(frozen=True)
@@ -10,19 +10,35 @@ class RegisterUserCommand:
     user: User
 
 
+@dataclass(frozen=True)
+class BulkRegisterUserCommand:
+    users: list[User]
+
+
 @dataclass(frozen=True)
 class LoginUserCommand:
-    email: str
-    username: str
     password: str
+    email: str | None = None
+    username: str | None = None
+
+
+@dataclass(frozen=True)
+class RefreshTokenCommand:
+    refresh_token: str
+
+
+@dataclass(frozen=True)
+class LogoutUserCommand:
+    claims: TokenClaims
+    refresh_token: str | None = None
 
 
 @dataclass(frozen=True)
 class ChangePasswordCommand:
-    email: str | None = None
-    username: str | None = None
     current_password: str
     new_password: str
+    email: str | None = None
+    username: str | None = None
 
 
 @dataclass(frozen=True)
@@ -30,6 +46,12 @@ class GetUserCommand:
     oid: UUID
 
 
+@dataclass(frozen=True)
+class GetListUserCommand:
+    cursor: str | None = None
+    limit: int | None = None
+
+
 @dataclass(frozen=True)
 class ForgetPasswordCommand:
     email: str
@@ -3,9 +3,9 @@ from dataclasses import dataclass
 from src.domain.base.entities import BaseEntity
 
 
-@dataclass
+@dataclass(slots=True)
 class User(BaseEntity):
     email: str
     username: str
     password: str
-    is_active: bool
+    is_active: bool = False
@@ -25,6 +25,10 @@ class OldPasswordInCorrectException(CrendentialUserException):
     pass
 
 
+class TokenInvalidException(CrendentialUserException):
+    pass
+
+
 class CodeException(BaseUserException):
     pass
 
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from datetime import timedelta
+from uuid import UUID
 
+from src.domain.base.pagination import Page
 from src.domain.user.entities import User
+from src.domain.user.value_objects import TokenClaims
 
 
 class IAuthAvailableAreProvidedService(ABC):
@@ -12,11 +16,13 @@ class IAuthAvailableAreProvidedService(ABC):
 
 class ICodeService(ABC):
     @abstractmethod
-    def generate_code(self, email: str, expire_delta: timedelta | None = None) -> str:
+    async def generate_code(
+        self, email: str, expire_delta: timedelta | None = None
+    ) -> str:
         pass
 
     @abstractmethod
-    def validate_code(self, email: str, code: str) -> bool:
+    async def validate_code(self, email: str, code: str) -> bool:
         pass
 
 
@@ -32,15 +38,33 @@ class IPasswordService(ABC):
         pass
 
     @abstractmethod
-    def verify_password(self, plain_password: str, hash_password: str) -> bool:
+    async def verify_password_async(
+        self, plain_password: str, hash_password: str
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_hash_password_async(self, plain_password: str) -> str:
+        pass
+
+    @abstractmethod
+    async def get_hash_passwords_async(self, plain_passwords: list[str]) -> list[str]:
         pass
 
     @abstractmethod
-    def get_hash_password(self, plain_password: str) -> str:
+    async def verify_and_update_password_async(
+        self, plain_password: str, hash_password: str
+    ) -> tuple[bool, str | None]:
         pass
 
 
 class ILoginService(ABC):
+    @abstractmethod
+    def generate_access_token(
+        self, user_oid: str, expire_delta: timedelta | None = None
+    ) -> str:
+        pass
+
     @abstractmethod
     def generate_token_and_is_active(
         self, user: User, expire_delta: timedelta | None = None
@@ -48,21 +72,78 @@ class ILoginService(ABC):
         pass
 
 
+class IRefreshTokenService(ABC):
+    @abstractmethod
+    async def issue(self, user: User) -> str:
+        pass
+
+    @abstractmethod
+    async def rotate(self, refresh_token: str) -> tuple[str, str]:
+        pass
+
+    @abstractmethod
+    async def revoke(self, refresh_token: str) -> None:
+        pass
+
+
+class ITokenService(ABC):
+    @abstractmethod
+    def verify_token(self, token: str) -> TokenClaims:
+        pass
+
+
+class ITokenRevocationService(ABC):
+    @abstractmethod
+    async def revoke(self, claims: TokenClaims) -> None:
+        pass
+
+    @abstractmethod
+    async def is_revoked(self, claims: TokenClaims) -> bool:
+        pass
+
+
 class IUserService(ABC):
     @abstractmethod
     async def get_by_username_or_email(
-        self, username: str | None = None, email: str | None = None
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        read_your_writes: bool = False,
     ) -> User:
         pass
 
     @abstractmethod
-    async def get_all_users(self) -> list[User] | None:
+    async def get_by_oid(self, oid: str, read_your_writes: bool = False) -> User:
+        pass
+
+    @abstractmethod
+    async def get_by_oids(self, oids: list[UUID]) -> list[User]:
+        pass
+
+    @abstractmethod
+    async def get_users_page(
+        self, cursor: str | None = None, limit: int | None = None
+    ) -> Page[User]:
+        pass
+
+    @abstractmethod
+    def stream_users(self) -> AsyncIterator[User]:
+        pass
+
+    @abstractmethod
+    async def get_existing_usernames_and_emails(
+        self, usernames: list[str], emails: list[str]
+    ) -> list[tuple[str, str]]:
         pass
 
     @abstractmethod
     async def create(self, user: User) -> User:
         pass
 
+    @abstractmethod
+    async def bulk_create(self, users: list[User]) -> list[str]:
+        pass
+
     @abstractmethod
     async def update(self, user: User) -> User:
         pass
@@ -70,3 +151,15 @@ class IUserService(ABC):
     @abstractmethod
     async def delete(self, oid: str) -> User:
         pass
+
+
+class IUserLoader(ABC):
+    """Per-request loader batching user lookups by oid"""
+
+    @abstractmethod
+    async def load(self, oid: UUID | str) -> User:
+        pass
+
+    @abstractmethod
+    async def load_many(self, oids: list[UUID | str]) -> list[User]:
+        pass
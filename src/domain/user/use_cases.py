@@ -1,59 +1,167 @@
+import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
+from src.domain.base.pagination import Page
 from src.domain.user.commands import (
+    BulkRegisterUserCommand,
     ChangePasswordCommand,
     CreateNewPasswordCommand,
     ForgetPasswordCommand,
+    GetListUserCommand,
     GetUserCommand,
     LoginUserCommand,
+    LogoutUserCommand,
+    RefreshTokenCommand,
     RegisterUserCommand,
     VerifyCodeSentToEmailForForgetPasswordCommand,
 )
 from src.domain.user.entities import User
 from src.domain.user.errors import (
-    OldPasswordIncorrectException,
+    OldPasswordInCorrectException,
     PasswordInvalidException,
-    UserIsExsitedException,
 )
 from src.domain.user.services import (
     ICodeService,
     ILoginService,
     IPasswordService,
+    IRefreshTokenService,
     ISendCodeService,
+    ITokenRevocationService,
     IUserService,
 )
+from src.domain.user.value_objects import (
+    BulkRegisterConflict,
+    BulkRegisterResult,
+    TokenPair,
+)
 from src.helper.errors import fail
 
 
 @dataclass(frozen=True)
 class RegisterUserUseCase:
     user_service: IUserService
+    password_service: IPasswordService
 
     async def execute(self, command: RegisterUserCommand) -> User:
-        if await self.user_service.get_by_username_or_email(
-            command.user.username, command.user.email
-        ):
-            fail(UserIsExsitedException("The user is exsited. Please login account"))
+        command.user.password = await self.password_service.get_hash_password_async(
+            command.user.password
+        )
         return await self.user_service.create(command.user)
 
 
+@dataclass(frozen=True)
+class BulkRegisterUserUseCase:
+    user_service: IUserService
+    password_service: IPasswordService
+
+    async def execute(self, command: BulkRegisterUserCommand) -> BulkRegisterResult:
+        started = time.perf_counter()
+        conflicts: list[BulkRegisterConflict] = []
+
+        def reject(user: User, reason: str) -> None:
+            conflicts.append(BulkRegisterConflict(user.username, user.email, reason))
+
+        candidates: list[User] = []
+        usernames: set[str] = set()
+        emails: set[str] = set()
+        for user in command.users:
+            if user.username in usernames or user.email.lower() in emails:
+                reject(user, "The user is duplicated in the import")
+                continue
+            try:
+                self.password_service.validate_password_strength(user.password)
+            except PasswordInvalidException as exc:
+                reject(user, str(exc))
+                continue
+            usernames.add(user.username)
+            emails.add(user.email.lower())
+            candidates.append(user)
+
+        existing = await self.user_service.get_existing_usernames_and_emails(
+            list(usernames), list(emails)
+        )
+        existing_usernames = {username for username, _ in existing}
+        existing_emails = {email.lower() for _, email in existing}
+        users: list[User] = []
+        for user in candidates:
+            if (
+                user.username in existing_usernames
+                or user.email.lower() in existing_emails
+            ):
+                reject(user, "The user is exsited")
+            else:
+                users.append(user)
+
+        if users:
+            hash_passwords = await self.password_service.get_hash_passwords_async(
+                [user.password for user in users]
+            )
+            for user, hash_password in zip(users, hash_passwords, strict=True):
+                user.password = hash_password
+            created = set(await self.user_service.bulk_create(users))
+            for user in users:
+                if user.username not in created:
+                    reject(user, "The user was registered concurrently")
+        else:
+            created = set()
+
+        return BulkRegisterResult(
+            created=len(created),
+            conflicts=conflicts,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+
 @dataclass(frozen=True)
 class LoginUserUseCase:
     login_service: ILoginService
+    refresh_token_service: IRefreshTokenService
     user_service: IUserService
     password_service: IPasswordService
 
-    async def execute(self, command: LoginUserCommand) -> str:
+    async def execute(self, command: LoginUserCommand) -> TokenPair:
         user = await self.user_service.get_by_username_or_email(
             command.username, command.email
         )
-        if not self.password_service.verify_password(command.password, user.password):
+        verify = self.password_service.verify_and_update_password_async
+        is_valid, new_hash = await verify(command.password, user.password)
+        if not is_valid:
             fail(
                 PasswordInvalidException("Invalid password. The password is incorrect")
             )
-        token = await self.login_service.generate_token_and_is_active(user)
+        if new_hash:
+            user.password = new_hash
+        token = self.login_service.generate_token_and_is_active(user)
         await self.user_service.update(user)
-        return token
+        refresh_token = await self.refresh_token_service.issue(user)
+        return TokenPair(access_token=token, refresh_token=refresh_token)
+
+
+@dataclass(frozen=True)
+class RefreshTokenUseCase:
+    login_service: ILoginService
+    refresh_token_service: IRefreshTokenService
+
+    async def execute(self, command: RefreshTokenCommand) -> TokenPair:
+        user_oid, refresh_token = await self.refresh_token_service.rotate(
+            command.refresh_token
+        )
+        return TokenPair(
+            access_token=self.login_service.generate_access_token(user_oid),
+            refresh_token=refresh_token,
+        )
+
+
+@dataclass(frozen=True)
+class LogoutUserUseCase:
+    token_revocation_service: ITokenRevocationService
+    refresh_token_service: IRefreshTokenService
+
+    async def execute(self, command: LogoutUserCommand) -> None:
+        await self.token_revocation_service.revoke(command.claims)
+        if command.refresh_token:
+            await self.refresh_token_service.revoke(command.refresh_token)
 
 
 @dataclass(frozen=True)
@@ -68,8 +176,11 @@ class GetUserUseCase:
 class GetListUserUseCase:
     user_service: IUserService
 
-    async def execute(self) -> list[User] | None:
-        return await self.user_service.get_all_users()
+    async def execute(self, command: GetListUserCommand) -> Page[User]:
+        return await self.user_service.get_users_page(command.cursor, command.limit)
+
+    def stream(self) -> AsyncIterator[User]:
+        return self.user_service.stream_users()
 
 
 @dataclass(frozen=True)
@@ -78,19 +189,19 @@ class ChangePasswordUseCase:
     user_service: IUserService
 
     async def execute(self, command: ChangePasswordCommand) -> str:
-        user = await self.user_service.get_by_username_email(
-            command.username, command.emai
+        user = await self.user_service.get_by_username_or_email(
+            command.username, command.email
         )
-        if self.password_service.verify_password(
+        if await self.password_service.verify_password_async(
             command.current_password, user.password
         ):
-            hash_password = self.password_service.get_hash_password(
+            hash_password = await self.password_service.get_hash_password_async(
                 command.new_password
             )
             user.password = hash_password
             await self.user_service.update(user)
             return command.new_password
-        fail(OldPasswordIncorrectException)
+        fail(OldPasswordInCorrectException)
 
 
 @dataclass(frozen=True)
@@ -100,19 +211,23 @@ class ForgetPasswordUseCase:
     user_service: IUserService
     password_service: IPasswordService
 
-    def execute_one(self, command: ForgetPasswordCommand) -> str:
-        user = await self.user_service.get_by_username_or_email(command.email)
-        code = self.code_service.generate_code(user.email)
+    async def execute_one(self, command: ForgetPasswordCommand) -> str:
+        user = await self.user_service.get_by_username_or_email(email=command.email)
+        code = await self.code_service.generate_code(user.email)
         self.send_service.send_code(user.email, code)
         return code
 
-    async def execute_two(self, command: VerifyCodeSentToEmailForForgetPasswordCommand) -> User:
-        user = await self.user_service.get_by_username_or_email(command.email)
-        self.code_service.validate_code(command.email, command.code)
+    async def execute_two(
+        self, command: VerifyCodeSentToEmailForForgetPasswordCommand
+    ) -> User:
+        user = await self.user_service.get_by_username_or_email(email=command.email)
+        await self.code_service.validate_code(command.email, command.code)
         return user
 
     async def execute_three(self, command: CreateNewPasswordCommand) -> str:
-        hash_password = self.password_service.get_hash_password(command.password)
+        hash_password = await self.password_service.get_hash_password_async(
+            command.password
+        )
         command.user.password = hash_password
         await self.user_service.update(command.user)
         return command.password
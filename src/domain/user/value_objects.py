@@ -1,6 +1,41 @@
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 
 
 class AuthAvailableAreProvided(str, Enum):
     google = "google"
     apple = "apple"
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    sub: str
+    exp: datetime
+    jti: str | None = None
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+@dataclass(frozen=True)
+class BulkRegisterConflict:
+    username: str
+    email: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class BulkRegisterResult:
+    created: int
+    conflicts: list[BulkRegisterConflict]
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        total = self.created + len(self.conflicts)
+        return total / self.elapsed_seconds if self.elapsed_seconds else 0.0
@@ -0,0 +1,82 @@
+import asyncio
+import math
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from src.helper.errors import ServiceOverloadedException, fail
+
+
+@dataclass(frozen=True)
+class AdmissionStats:
+    in_flight: int
+    waiting: int
+    admitted: int
+    shed: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue and a queue-time budget.
+
+    Callers that find the queue full, or that wait longer than
+    ``max_wait_seconds`` for a slot, are shed with ``ServiceOverloadedException``
+    instead of piling up behind the work already admitted.
+    """
+
+    def __init__(
+        self, max_concurrency: int, max_queue_size: int, max_wait_seconds: float
+    ) -> None:
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_queue_size = max_queue_size
+        self._max_wait_seconds = max_wait_seconds
+        self._retry_after = max(1, math.ceil(max_wait_seconds))
+        self._in_flight = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._shed = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @property
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            in_flight=self._in_flight,
+            waiting=self._waiting,
+            admitted=self._admitted,
+            shed=self._shed,
+            wait_seconds_total=self._wait_seconds_total,
+            wait_seconds_max=self._wait_seconds_max,
+        )
+
+    def _reject(self, message: str) -> None:
+        self._shed += 1
+        fail(ServiceOverloadedException(message, retry_after=self._retry_after))
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncGenerator[None, None]:
+        if self._semaphore.locked() and self._waiting >= self._max_queue_size:
+            self._reject("The service is overloaded. The wait queue is full")
+
+        self._waiting += 1
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self._max_wait_seconds):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self._reject("The service is overloaded. The queue time budget is exceeded")
+        finally:
+            self._waiting -= 1
+            waited = time.monotonic() - started
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        self._admitted += 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
@@ -0,0 +1,69 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Collects the ``load`` calls made within one event-loop tick into batches.
+
+    The first ``load`` of a tick schedules a dispatch with ``call_soon``, which
+    runs after the tasks already scheduled for that tick have made their calls.
+    Each batch of at most ``max_batch_size`` distinct keys is one ``load_many``
+    call returning the values it found; missing keys load as ``None``.
+    Results are memoized for the lifetime of the loader, so create one per
+    request; a failed batch is forgotten and its keys are loaded again.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[K]], Awaitable[dict[K, V]]],
+        max_batch_size: int,
+    ) -> None:
+        self._load_many = load_many
+        self._max_batch_size = max_batch_size
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._pending: list[K] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V | None:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        # a cancelled caller must not cancel the future other callers share
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self._max_batch_size):
+            task = asyncio.ensure_future(
+                self._load_batch(pending[start : start + self._max_batch_size])
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, keys: list[K]) -> None:
+        try:
+            values = await self._load_many(keys)
+        except asyncio.CancelledError:
+            for key in keys:
+                self._futures.pop(key).cancel()
+            raise
+        except Exception as exc:
+            for key in keys:
+                future = self._futures.pop(key)
+                future.set_exception(exc)
+                # retrieved here so futures whose callers have gone do not warn
+                future.exception()
+            return
+        for key in keys:
+            self._futures[key].set_result(values.get(key))
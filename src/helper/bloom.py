@@ -0,0 +1,54 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Set membership with no false negatives in a fixed bit array.
+
+    Sized for ``capacity`` keys at ``error_rate`` false positives. Bit positions
+    come from double hashing one blake2b digest, so a lookup hashes once.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size_in_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate at the current fill"""
+        return (
+            1 - math.exp(-self.num_hashes * self._count / self.num_bits)
+        ) ** self.num_hashes
+
+    def _positions(self, key: bytes) -> list[int]:
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [
+            (first + index * second) % self.num_bits for index in range(self.num_hashes)
+        ]
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
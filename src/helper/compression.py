@@ -0,0 +1,108 @@
+import asyncio
+import zlib
+from functools import lru_cache
+from types import ModuleType
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# compressing above this runs in a thread, zlib and brotli release the GIL
+OFFLOAD_SIZE = 256 * 1024
+
+
+@lru_cache(maxsize=1)
+def brotli_module() -> ModuleType | None:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def accepted_encodings(header: str) -> set[str]:
+    encodings = set()
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(name.strip())
+    return encodings
+
+
+class CompressionMiddleware:
+    """Compresses response bodies of at least ``minimum_size`` bytes.
+
+    Brotli is preferred when the client accepts it and the optional brotli
+    package is installed, gzip otherwise. Only responses sent in one body
+    message are compressed; streaming responses pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, scope) -> str | None:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if "br" in accepted and brotli_module() is not None:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli_module().compress(body, quality=self.brotli_quality)
+        compressor = zlib.compressobj(
+            self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+        return compressor.compress(body) + compressor.flush()
+
+    async def __call__(self, scope, receive, send) -> None:
+        encoding = self.choose_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start = None
+
+        async def send_compressed(message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+            ):
+                await send(start)
+                start = None
+                await send(message)
+                return
+            if len(body) >= OFFLOAD_SIZE:
+                body = await asyncio.to_thread(self.compress, body, encoding)
+            else:
+                body = self.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            start = None
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
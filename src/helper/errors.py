@@ -1,2 +1,8 @@
 def fail(exc: Exception):
     raise exc
+
+
+class ServiceOverloadedException(Exception):
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
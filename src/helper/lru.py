@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class LRUCache(Generic[K, V]):
+    """Bounded LRU mapping whose entries also expire.
+
+    Every entry expires ``ttl_seconds`` after it is set unless ``set`` is given
+    its own monotonic ``expires_at``. ``on_remove`` is called for every entry
+    that is evicted, expires or is popped.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float | None = None,
+        on_remove: Callable[[K, V], None] | None = None,
+    ) -> None:
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._on_remove = on_remove
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+        )
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._expirations += 1
+            self._misses += 1
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        if expires_at is None:
+            expires_at = (
+                time.monotonic() + self._ttl_seconds
+                if self._ttl_seconds is not None
+                else float("inf")
+            )
+        if key in self._entries:
+            self.pop(key)
+        self._entries[key] = (value, expires_at)
+        while len(self._entries) > self._max_size:
+            self._evictions += 1
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if self._on_remove is not None:
+            self._on_remove(key, entry[0])
+        return entry[0]
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self.pop(key)
@@ -0,0 +1,171 @@
+import re
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from typing import Any
+
+from prometheus_client import Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# bcrypt is tuned to ~250ms, the default buckets stop too early for it
+SLOW_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration by route template",
+    ["method", "route", "status"],
+    buckets=SLOW_BUCKETS,
+)
+SQL_STATEMENT_DURATION = Histogram(
+    "sql_statement_duration_seconds",
+    "SQL statement duration by engine, operation and table",
+    ["engine", "operation", "table"],
+    buckets=SLOW_BUCKETS,
+)
+PASSWORD_HASHING_DURATION = Histogram(
+    "password_hashing_duration_seconds",
+    "Password hashing duration including the wait for a worker",
+    ["operation"],
+    buckets=SLOW_BUCKETS,
+)
+TOKEN_DURATION = Histogram(
+    "token_duration_seconds",
+    "Access token encode and verify duration",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+EMAIL_SEND_DURATION = Histogram(
+    "email_send_duration_seconds",
+    "Time to queue an email and duration of each SendGrid request",
+    ["stage"],
+    buckets=SLOW_BUCKETS,
+)
+
+# children are bound once, labels() is a dict lookup under a lock
+PASSWORD_HASH = PASSWORD_HASHING_DURATION.labels(operation="hash")
+PASSWORD_HASH_MANY = PASSWORD_HASHING_DURATION.labels(operation="hash_many")
+PASSWORD_VERIFY = PASSWORD_HASHING_DURATION.labels(operation="verify")
+PASSWORD_VERIFY_AND_UPDATE = PASSWORD_HASHING_DURATION.labels(
+    operation="verify_and_update"
+)
+TOKEN_ENCODE = TOKEN_DURATION.labels(operation="encode")
+TOKEN_VERIFY = TOKEN_DURATION.labels(operation="verify")
+EMAIL_ENQUEUE = EMAIL_SEND_DURATION.labels(stage="enqueue")
+EMAIL_REQUEST = EMAIL_SEND_DURATION.labels(stage="request")
+
+STATEMENT_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)', re.IGNORECASE)
+
+
+def statement_labels(statement: str) -> tuple[str, str]:
+    """Operation and first table, a bounded label set unlike the SQL text"""
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    match = STATEMENT_TABLE.search(statement)
+    return operation, match.group(1) if match else ""
+
+
+def instrument_engine(
+    engine: AsyncEngine, name: str, read_only_name: str | None = None
+) -> None:
+    """Time every statement on ``engine``.
+
+    With ``read_only_name``, statements on read-only connections of a pool
+    shared with the writer are labelled with it instead of ``name``.
+    """
+    labels: dict[str, tuple[str, str]] = {}
+
+    def engine_name(conn) -> str:
+        if read_only_name is None:
+            return name
+        options = conn.get_execution_options()
+        if options.get("isolation_level") == "AUTOCOMMIT" or options.get(
+            "postgresql_readonly"
+        ):
+            return read_only_name
+        return name
+
+    def before(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["statement_started"].pop()
+        if statement not in labels:
+            labels[statement] = statement_labels(statement)
+        operation, table = labels[statement]
+        SQL_STATEMENT_DURATION.labels(engine_name(conn), operation, table).observe(
+            time.perf_counter() - started
+        )
+
+    def handle_error(context) -> None:
+        if context.connection is not None:
+            stack = context.connection.info.get("statement_started")
+            if stack:
+                stack.pop()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before)
+    event.listen(engine.sync_engine, "after_cursor_execute", after)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+class StatsCollector(Collector):
+    """Exposes the stats dataclasses components already keep as gauges.
+
+    ``sources`` maps a metric prefix to a callable returning ``{label: stats}``;
+    every numeric stats field becomes ``<prefix>_<field>`` read at scrape time.
+    """
+
+    def __init__(self, sources: dict[str, Callable[[], dict[str, Any]]]) -> None:
+        self._sources = sources
+
+    def collect(self):
+        for prefix, source in self._sources.items():
+            families: dict[str, GaugeMetricFamily] = {}
+            for name, stats in source().items():
+                for field, value in asdict(stats).items():
+                    if not isinstance(value, int | float):
+                        continue
+                    if field not in families:
+                        families[field] = GaugeMetricFamily(
+                            f"{prefix}_{field}", f"{prefix} {field}", labels=["name"]
+                        )
+                    families[field].add_metric([name], value)
+            yield from families.values()
+
+
+class MetricsMiddleware:
+    """Per-route latency histogram.
+
+    A plain ASGI middleware, BaseHTTPMiddleware would add a task and a memory
+    stream to every request. The route template is only known after routing,
+    so it is read from the scope once the app has run; unmatched paths share
+    one label to keep cardinality bounded.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            ).observe(time.perf_counter() - started)
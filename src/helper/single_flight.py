@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    in_flight: int
+    calls: int
+    executions: int
+    shared: int
+    errors: int
+    cancellations: int
+
+
+@dataclass
+class _Counters:
+    calls: int = 0
+    executions: int = 0
+    shared: int = 0
+    errors: int = 0
+    cancellations: int = 0
+
+
+class _Flight(Generic[V]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[V]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesces concurrent calls for the same key into one execution.
+
+    Callers arriving while a call for their key is in flight await the same
+    task and get its result or exception; nothing is kept once it finishes.
+    The call runs in its own task, so a cancelled caller does not cancel it
+    for the others, it is only cancelled when every caller has gone. Stats are
+    kept per group, the first item of tuple keys, so labels stay bounded.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[K, _Flight[V]] = {}
+        self._counters: dict[Hashable, _Counters] = {}
+
+    @property
+    def stats(self) -> dict[str, SingleFlightStats]:
+        in_flight: dict[Hashable, int] = {}
+        for key in self._flights:
+            group = self._group(key)
+            in_flight[group] = in_flight.get(group, 0) + 1
+        return {
+            str(group): SingleFlightStats(
+                in_flight=in_flight.get(group, 0),
+                calls=counters.calls,
+                executions=counters.executions,
+                shared=counters.shared,
+                errors=counters.errors,
+                cancellations=counters.cancellations,
+            )
+            for group, counters in self._counters.items()
+        }
+
+    @staticmethod
+    def _group(key: K) -> Hashable:
+        return key[0] if isinstance(key, tuple) and key else key
+
+    def _counters_for(self, key: K) -> _Counters:
+        group = self._group(key)
+        counters = self._counters.get(group)
+        if counters is None:
+            counters = self._counters[group] = _Counters()
+        return counters
+
+    async def do(self, key: K, call: Callable[[], Awaitable[V]]) -> V:
+        counters = self._counters_for(key)
+        counters.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            counters.executions += 1
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(
+                lambda task: self._finish(key, flight, counters)
+            )
+        else:
+            counters.shared += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                counters.cancellations += 1
+                # the task only finishes on a later tick, callers arriving
+                # before that must start a new call rather than join this one
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: K, flight: _Flight[V], counters: _Counters) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            counters.errors += 1
+
+    def forget(self, key: K) -> None:
+        """Later callers start a new call, the running one still completes"""
+        self._flights.pop(key, None)
@@ -0,0 +1,107 @@
+import heapq
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+class ICodeStore(ABC):
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    async def pop(self, key: str) -> str | None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCodeStore(ICodeStore):
+    """Per-process store bounded by ``max_size``.
+
+    A heap ordered by expiry drops expired entries on every access, and when the
+    store is full the entry closest to expiring makes room for the new one.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: dict[str, tuple[str, float]] = {}
+        self._expiry: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_live(self, expires_at: float, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] == expires_at
+
+    def _purge(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            if self._is_live(expires_at, key):
+                del self._entries[key]
+
+    def _evict_soonest(self) -> None:
+        while self._expiry:
+            expires_at, key = heapq.heappop(self._expiry)
+            if self._is_live(expires_at, key):
+                del self._entries[key]
+                return
+
+    def _compact(self) -> None:
+        """Overwritten keys leave stale heap items behind, drop them"""
+        self._expiry = [
+            (expires_at, key) for key, (_, expires_at) in self._entries.items()
+        ]
+        heapq.heapify(self._expiry)
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        now = time.monotonic()
+        self._purge(now)
+        if key not in self._entries and len(self._entries) >= self._max_size:
+            self._evict_soonest()
+        expires_at = now + ttl_seconds
+        self._entries[key] = (value, expires_at)
+        heapq.heappush(self._expiry, (expires_at, key))
+        if len(self._expiry) > 2 * self._max_size:
+            self._compact()
+
+    async def pop(self, key: str) -> str | None:
+        now = time.monotonic()
+        self._purge(now)
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry is not None else None
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self._expiry.clear()
+
+
+class RedisCodeStore(ICodeStore):
+    """Shared between workers, expiry is left to Redis key TTLs"""
+
+    def __init__(self, client: "Redis", prefix: str = "code:") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    @staticmethod
+    def from_url(url: str) -> "RedisCodeStore":
+        from redis.asyncio import Redis
+
+        return RedisCodeStore(Redis.from_url(url, decode_responses=True))
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await self._client.set(
+            self._prefix + key, value, px=max(1, int(ttl_seconds * 1000))
+        )
+
+    async def pop(self, key: str) -> str | None:
+        return await self._client.getdel(self._prefix + key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,339 @@
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable
+from dataclasses import replace
+from uuid import UUID
+
+from src.domain.user.entities import User
+from src.helper.lru import CacheStats, LRUCache
+from src.helper.single_flight import SingleFlight, SingleFlightStats
+from src.infrastructure.postgresql.repositories.user import IUserRepository
+
+
+class CachedUserRepository(IUserRepository):
+    """Read-through cache in front of another ``IUserRepository``.
+
+    Users are cached by oid with username and email indexes pointing at the oid.
+    Entities are mutable, so callers always get a copy of the cached one.
+
+    Every write through this repository bumps a generation and stamps the keys
+    it touches. A fill is dropped when one of its keys was written after the
+    read started, or, for replica reads, less than ``stale_seconds`` ago, since
+    a lagging replica can still return the old row. Updates write the returned
+    row through instead. Writes made by other workers are only picked up once
+    ``ttl_seconds`` runs out.
+    """
+
+    def __init__(
+        self,
+        repository: IUserRepository,
+        max_size: int,
+        ttl_seconds: float,
+        stale_seconds: float = 0.0,
+    ) -> None:
+        self.repository = repository
+        self._users: LRUCache[UUID, User] = LRUCache(
+            max_size, ttl_seconds, on_remove=self._unindex
+        )
+        self._oid_by_username: dict[str, UUID] = {}
+        self._oid_by_email: dict[str, UUID] = {}
+        self._stale_seconds = stale_seconds
+        self._generation = 0
+        # key -> (generation, monotonic time) of the last write touching it
+        self._written: dict[tuple[str, object], tuple[int, float]] = {}
+        # generation each in-flight read started at -> number of reads
+        self._reads: Counter[int] = Counter()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._users.stats
+
+    @staticmethod
+    def _keys(
+        oid: UUID | str | None = None,
+        username: str | None = None,
+        email: str | None = None,
+    ) -> list[tuple[str, object]]:
+        keys = []
+        if oid is not None:
+            keys.append(("oid", UUID(str(oid))))
+        if username:
+            keys.append(("username", username))
+        if email:
+            keys.append(("email", email.lower()))
+        return keys
+
+    def _unindex(self, oid: UUID, user: User) -> None:
+        if self._oid_by_username.get(user.username) == oid:
+            del self._oid_by_username[user.username]
+        if self._oid_by_email.get(user.email.lower()) == oid:
+            del self._oid_by_email[user.email.lower()]
+
+    def _oid_for(self, key: tuple[str, object]) -> UUID | None:
+        kind, value = key
+        if kind == "oid":
+            return value
+        if kind == "username":
+            return self._oid_by_username.get(value)
+        return self._oid_by_email.get(value)
+
+    def _set(self, user: User) -> None:
+        self._users.set(user.oid, replace(user))
+        self._oid_by_username[user.username] = user.oid
+        self._oid_by_email[user.email.lower()] = user.oid
+
+    def _is_fresh(self, user: User, started: int, replica: bool) -> bool:
+        now = time.monotonic()
+        for key in self._keys(user.oid, user.username, user.email):
+            written = self._written.get(key)
+            if written is None:
+                continue
+            generation, written_at = written
+            if generation > started or (
+                replica and now - written_at < self._stale_seconds
+            ):
+                return False
+        return True
+
+    async def _fill(self, read: Awaitable[User | None], replica: bool) -> User | None:
+        started = self._generation
+        self._reads[started] += 1
+        try:
+            user = await read
+        finally:
+            self._reads[started] -= 1
+            if not self._reads[started]:
+                del self._reads[started]
+        if user is not None and self._is_fresh(user, started, replica):
+            self._set(user)
+        return user
+
+    def _invalidate(self, keys: list[tuple[str, object]]) -> int:
+        """Drops the entries behind ``keys`` and stamps them with a new
+        generation, which is returned."""
+        self._generation += 1
+        now = time.monotonic()
+        for key in keys:
+            self._written[key] = (self._generation, now)
+            oid = self._oid_for(key)
+            if oid is not None:
+                self._users.pop(oid)
+        self._prune(now)
+        return self._generation
+
+    def _prune(self, now: float) -> None:
+        # stamps are needed while a read started before them is in flight, or
+        # while a replica may still return the rows they replaced
+        oldest_read = min(self._reads, default=self._generation)
+        expired = [
+            key
+            for key, (generation, written_at) in self._written.items()
+            if generation <= oldest_read and now - written_at >= self._stale_seconds
+        ]
+        for key in expired:
+            del self._written[key]
+
+    async def get_by_username_or_email(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        read_your_writes: bool = False,
+    ) -> User | None:
+        if not read_your_writes:
+            oid = (
+                self._oid_by_username.get(username)
+                if username
+                else self._oid_by_email.get(email.lower())
+            )
+            user = self._users.get(oid)
+            if user is not None:
+                return replace(user)
+        return await self._fill(
+            self.repository.get_by_username_or_email(username, email, read_your_writes),
+            replica=not read_your_writes,
+        )
+
+    async def get_by_oid(self, oid: str, read_your_writes: bool = False) -> User | None:
+        if not read_your_writes:
+            user = self._users.get(UUID(str(oid)))
+            if user is not None:
+                return replace(user)
+        return await self._fill(
+            self.repository.get_by_oid(oid, read_your_writes),
+            replica=not read_your_writes,
+        )
+
+    async def get_by_oids(self, oids: list[UUID]) -> list[User]:
+        users, missing = [], []
+        for oid in oids:
+            user = self._users.get(oid)
+            if user is not None:
+                users.append(replace(user))
+            else:
+                missing.append(oid)
+        if missing:
+            started = self._generation
+            self._reads[started] += 1
+            try:
+                found = await self.repository.get_by_oids(missing)
+            finally:
+                self._reads[started] -= 1
+                if not self._reads[started]:
+                    del self._reads[started]
+            for user in found:
+                if self._is_fresh(user, started, replica=True):
+                    self._set(user)
+                users.append(user)
+        return users
+
+    async def get_users_page(self, after: UUID | None, limit: int) -> list[User]:
+        return await self.repository.get_users_page(after, limit)
+
+    def stream_users(self, batch_size: int) -> AsyncIterator[User]:
+        return self.repository.stream_users(batch_size)
+
+    async def get_existing_usernames_and_emails(
+        self, usernames: list[str], emails: list[str]
+    ) -> list[tuple[str, str]]:
+        return await self.repository.get_existing_usernames_and_emails(
+            usernames, emails
+        )
+
+    async def create(self, user: User) -> User | None:
+        keys = self._keys(user.oid, user.username, user.email)
+        try:
+            return await self.repository.create(user)
+        finally:
+            self._invalidate(keys)
+
+    async def bulk_create(self, users: list[User]) -> list[str]:
+        keys = [
+            key for user in users for key in self._keys(None, user.username, user.email)
+        ]
+        try:
+            return await self.repository.bulk_create(users)
+        finally:
+            self._invalidate(keys)
+
+    async def update(self, user: User) -> User | None:
+        cached = self._users.get(user.oid)
+        keys = self._keys(user.oid, user.username, user.email)
+        if cached is not None:
+            keys += self._keys(None, cached.username, cached.email)
+        generation = self._invalidate(keys)
+        updated = None
+        try:
+            updated = await self.repository.update(user)
+        finally:
+            # the returned row is the committed state, unless another write to
+            # the same keys started meanwhile and may have committed after it
+            untouched = all(
+                self._written.get(key, (None, 0))[0] == generation for key in keys
+            )
+            self._invalidate(keys)
+            if updated is not None and untouched:
+                self._set(updated)
+        return updated
+
+    async def delete(self, oid: str) -> User | None:
+        keys = self._keys(oid)
+        deleted = None
+        try:
+            deleted = await self.repository.delete(oid)
+        finally:
+            if deleted is not None:
+                keys += self._keys(None, deleted.username, deleted.email)
+            self._invalidate(keys)
+        return deleted
+
+
+class SingleFlightUserRepository(IUserRepository):
+    """Coalesces concurrent identical lookups into one query.
+
+    Only replica reads are coalesced: a ``read_your_writes`` caller could
+    otherwise join a query that started before its own write. Writes through
+    this repository make lookups of the keys they touch that arrive after the
+    write start a new query. Every caller gets its own copy of the shared entity.
+    """
+
+    def __init__(self, repository: IUserRepository) -> None:
+        self.repository = repository
+        self._flights: SingleFlight[tuple[str, object], User | None] = SingleFlight()
+
+    @property
+    def stats(self) -> dict[str, SingleFlightStats]:
+        return self._flights.stats
+
+    def _forget(self, user: User) -> None:
+        if user.oid is not None:
+            self._flights.forget(("oid", UUID(str(user.oid))))
+        self._flights.forget(("username", user.username))
+        self._flights.forget(("email", user.email.lower()))
+
+    async def get_by_username_or_email(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        read_your_writes: bool = False,
+    ) -> User | None:
+        if read_your_writes:
+            return await self.repository.get_by_username_or_email(
+                username, email, read_your_writes
+            )
+        key = ("username", username) if username else ("email", email.lower())
+        user = await self._flights.do(
+            key, lambda: self.repository.get_by_username_or_email(username, email)
+        )
+        return replace(user) if user is not None else None
+
+    async def get_by_oid(self, oid: str, read_your_writes: bool = False) -> User | None:
+        if read_your_writes:
+            return await self.repository.get_by_oid(oid, read_your_writes)
+        user = await self._flights.do(
+            ("oid", UUID(str(oid))), lambda: self.repository.get_by_oid(oid)
+        )
+        return replace(user) if user is not None else None
+
+    async def get_by_oids(self, oids: list[UUID]) -> list[User]:
+        return await self.repository.get_by_oids(oids)
+
+    async def get_users_page(self, after: UUID | None, limit: int) -> list[User]:
+        return await self.repository.get_users_page(after, limit)
+
+    def stream_users(self, batch_size: int) -> AsyncIterator[User]:
+        return self.repository.stream_users(batch_size)
+
+    async def get_existing_usernames_and_emails(
+        self, usernames: list[str], emails: list[str]
+    ) -> list[tuple[str, str]]:
+        return await self.repository.get_existing_usernames_and_emails(
+            usernames, emails
+        )
+
+    async def create(self, user: User) -> User | None:
+        try:
+            return await self.repository.create(user)
+        finally:
+            self._forget(user)
+
+    async def bulk_create(self, users: list[User]) -> list[str]:
+        try:
+            return await self.repository.bulk_create(users)
+        finally:
+            for user in users:
+                self._forget(user)
+
+    async def update(self, user: User) -> User | None:
+        try:
+            return await self.repository.update(user)
+        finally:
+            self._forget(user)
+
+    async def delete(self, oid: str) -> User | None:
+        try:
+            user = await self.repository.delete(oid)
+        finally:
+            self._flights.forget(("oid", UUID(str(oid))))
+        if user is not None:
+            self._forget(user)
+        return user
@@ -0,0 +1,234 @@
+import asyncio
+import itertools
+import logging
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.helper.errors import ServiceOverloadedException, fail
+from src.helper.metrics import EMAIL_REQUEST
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# SendGrid accepts at most 1000 personalizations per request
+MAX_PERSONALIZATIONS = 1000
+# concurrent single-recipient requests when a batch is rejected as a whole
+MAX_FALLBACK_REQUESTS = 10
+
+
+@dataclass(frozen=True)
+class EmailMessage:
+    """``substitutions`` are replaced per recipient, so messages that share a
+    subject and content can go out in one request."""
+
+    to: str
+    subject: str
+    html_content: str
+    substitutions: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class EmailDispatchStats:
+    queued: int
+    sent: int
+    requests: int
+    retries: int
+    failed: int
+
+
+class IEmailDispatcher(ABC):
+    @abstractmethod
+    def enqueue(self, message: EmailMessage) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class SendGridEmailDispatcher(IEmailDispatcher):
+    """Sends email through the SendGrid v3 API from a background worker.
+
+    ``enqueue`` returns immediately; a full queue sheds the caller with
+    ``ServiceOverloadedException``. The worker drains whatever is queued, groups
+    messages by subject and content into one request each, and retries 429s,
+    5xxs and transport errors with exponential backoff and jitter. A request
+    rejected with 400 is split into one request per message. All requests
+    share one ``httpx.AsyncClient`` and so one connection pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        from_email: str,
+        api_url: str,
+        max_queue_size: int,
+        max_batch_size: int,
+        max_retries: int,
+        backoff_seconds: float,
+        timeout: float,
+    ) -> None:
+        self._api_key = api_key
+        self._from_email = from_email
+        self._api_url = api_url
+        self._max_queue_size = max_queue_size
+        self._max_batch_size = min(max_batch_size, MAX_PERSONALIZATIONS)
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._timeout = timeout
+        self._queue: asyncio.Queue[EmailMessage] | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._worker: asyncio.Task | None = None
+        self._sent = 0
+        self._requests = 0
+        self._retries = 0
+        self._failed = 0
+
+    @property
+    def stats(self) -> EmailDispatchStats:
+        return EmailDispatchStats(
+            queued=self._queue.qsize() if self._queue else 0,
+            sent=self._sent,
+            requests=self._requests,
+            retries=self._retries,
+            failed=self._failed,
+        )
+
+    def _start(self) -> None:
+        # the queue, client and worker need the running loop, so they are made
+        # on first use rather than in __init__
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._max_queue_size)
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self._api_key}"},
+                timeout=self._timeout,
+            )
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, message: EmailMessage) -> None:
+        self._start()
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            fail(ServiceOverloadedException("Too many emails are waiting to be sent"))
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Flush what is queued, then stop the worker and the connection pool"""
+        if self._queue is not None and self._worker is not None:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._queue.join()
+            except TimeoutError:
+                pass
+            self._worker.cancel()
+            # a batch still being sent must stop using the client before it
+            # is closed
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._client is not None:
+            await self._client.aclose()
+        self._queue = self._client = self._worker = None
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self.send_batch(batch)
+            except Exception:
+                # the worker only restarts on the next enqueue, keep it alive
+                self._failed += len(batch)
+                logger.exception("Sending %d emails failed", len(batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        def key(message: EmailMessage) -> tuple[str, str]:
+            return message.subject, message.html_content
+
+        groups = itertools.groupby(sorted(messages, key=key), key=key)
+        await asyncio.gather(
+            *(
+                self._send((subject, html_content), list(group))
+                for (subject, html_content), group in groups
+            )
+        )
+
+    def _payload(
+        self, subject: str, html_content: str, messages: list[EmailMessage]
+    ) -> dict:
+        return {
+            "personalizations": [
+                {"to": [{"email": message.to}], "substitutions": message.substitutions}
+                if message.substitutions
+                else {"to": [{"email": message.to}]}
+                for message in messages
+            ],
+            "from": {"email": self._from_email},
+            "subject": subject,
+            "content": [{"type": "text/html", "value": html_content}],
+        }
+
+    async def _send(
+        self, content: tuple[str, str], messages: list[EmailMessage]
+    ) -> None:
+        status_code = await self._post(self._payload(*content, messages))
+        if status_code is None:
+            self._sent += len(messages)
+            return
+        if status_code == 400 and len(messages) > 1:
+            # one bad recipient rejects the whole request, send them one by one
+            # so only that one fails
+            limit = asyncio.Semaphore(MAX_FALLBACK_REQUESTS)
+
+            async def send_one(message: EmailMessage) -> None:
+                async with limit:
+                    await self._send(content, [message])
+
+            await asyncio.gather(*(send_one(message) for message in messages))
+            return
+        self._failed += len(messages)
+        logger.warning(
+            "SendGrid rejected %d emails with status %s", len(messages), status_code
+        )
+
+    async def _post(self, payload: dict) -> int | None:
+        """None once the request succeeds, else the last status code, 0 for a
+        transport error"""
+        import httpx
+
+        status_code = 0
+        for attempt in range(self._max_retries + 1):
+            delay = self._backoff_seconds * 2**attempt * random.uniform(0.5, 1.5)
+            try:
+                with EMAIL_REQUEST.time():
+                    response = await self._client.post(self._api_url, json=payload)
+            except httpx.TransportError:
+                status_code = 0
+            else:
+                self._requests += 1
+                if response.is_success:
+                    return None
+                status_code = response.status_code
+                if status_code != 429 and status_code < 500:
+                    return status_code
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            if attempt < self._max_retries:
+                self._retries += 1
+                await asyncio.sleep(delay)
+        return status_code
@@ -6,8 +6,10 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from sqlalchemy.util.concurrency import await_only, in_greenlet
 
-from src.core.config.settings import settings
+from src.core.config.settings import get_settings
 from src.infrastructure.postgresql.models.base import BaseORM
+from src.infrastructure.postgresql.models.refresh_token import *  # noqa
+from src.infrastructure.postgresql.models.revoked_token import *  # noqa
 from src.infrastructure.postgresql.models.user import *  # noqa
 
 # this is the Alembic Config object, which provides
@@ -26,7 +28,7 @@ if config.config_file_name is not None:
 target_metadata = BaseORM.metadata
 
 
-config.set_main_option("sqlalchemy.url", settings.POSTGRES_URL)
+config.set_main_option("sqlalchemy.url", get_settings().POSTGRES_URL)
 
 
 def include_name(name, type_, parent_names):
@@ -0,0 +1,33 @@
+"""add user email
+
+Revision ID: 5d0c2f7a9b13
+Revises: a6e8f745837a
+Create Date: 2026-10-18 10:12:04.318220
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d0c2f7a9b13"
+down_revision: Union[str, None] = "a6e8f745837a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The model required email from the start, so no row could be inserted
+    # without the column and there is nothing to backfill.
+    op.add_column("user", sa.Column("email", sa.String(), nullable=False))
+    op.create_index(
+        "ix_user_email_lower", "user", [sa.text("lower(email)")], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_email_lower", table_name="user")
+    op.drop_column("user", "email")
@@ -0,0 +1,30 @@
+"""drop duplicate unique constraint on user.oid
+
+Revision ID: 9e4b6a1c2d85
+Revises: 5d0c2f7a9b13
+Create Date: 2026-10-18 11:40:27.905113
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b6a1c2d85"
+down_revision: Union[str, None] = "5d0c2f7a9b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pk_user already indexes oid uniquely. Revision a6e8f745837a declares
+    # uq_user_oid too, but SQLAlchemy skips a unique constraint on the primary
+    # key columns, so only databases created another way have it.
+    op.execute('ALTER TABLE "user" DROP CONSTRAINT IF EXISTS uq_user_oid')
+
+
+def downgrade() -> None:
+    # not recreated: the schema a6e8f745837a builds never had it
+    pass
@@ -1,18 +1,100 @@
+import asyncio
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Any
 
+from sqlalchemy import Executable
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from src.core.config.settings import settings
+from src.core.config.settings import get_settings
+from src.helper.metrics import instrument_engine
+from src.infrastructure.postgresql.replicas import (
+    STREAMING_EXECUTION_OPTIONS,
+    Replica,
+    ReplicaSet,
+)
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    acquired: int
+    acquire_wait_seconds_total: float
+    acquire_wait_seconds_max: float
+
+
+class PoolMonitor:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._acquired = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    async def acquire(self, session: AsyncSession) -> None:
+        started = time.monotonic()
+        await session.connection()
+        waited = time.monotonic() - started
+        self._acquired += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+    @property
+    def stats(self) -> PoolStats:
+        pool = self._engine.pool
+        return PoolStats(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            acquired=self._acquired,
+            acquire_wait_seconds_total=self._wait_seconds_total,
+            acquire_wait_seconds_max=self._wait_seconds_max,
+        )
+
+
+def create_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    settings = get_settings()
+    return create_async_engine(
+        url=url,
+        echo=False,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        **kwargs,
+    )
 
 
 class Database:
-    def __init__(self, url: str = settings.POSTGRES_URL) -> None:
-        self._write_and_read_async_engine = create_async_engine(
-            url=url, echo=False, isolation_level="READ COMMITTED"
+    def __init__(
+        self,
+        url: str | None = None,
+        share_pool: bool | None = None,
+        replica_urls: list[str] | None = None,
+    ) -> None:
+        settings = get_settings()
+        if url is None:
+            url = settings.POSTGRES_URL
+        if share_pool is None:
+            share_pool = settings.POSTGRES_READ_ONLY_SHARE_POOL
+        if replica_urls is None:
+            replica_urls = settings.POSTGRES_REPLICA_URLS
+        self._write_and_read_async_engine = create_engine(
+            url=url, isolation_level="READ COMMITTED"
         )
+        self._write_and_read_pool = PoolMonitor(self._write_and_read_async_engine)
         """expire_on_commit - don't expire objects after transaction commit"""
         self._write_and_read_async_session = async_sessionmaker(
             bind=self._write_and_read_async_engine,
@@ -21,22 +103,127 @@ class Database:
             autoflush=False,
         )
 
-        self._read_only_async_engine = create_async_engine(
-            url=url, echo=False, isolation_level="AUTOCOMMIT"
-        )
-        """autocommit=True: Read-only session should be autocommit"""
+        if share_pool:
+            """Same pool as the writer, connections are switched to AUTOCOMMIT"""
+            self._read_only_async_engine = (
+                self._write_and_read_async_engine.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+            )
+            self._read_only_pool = self._write_and_read_pool
+        else:
+            self._read_only_async_engine = create_engine(
+                url=url, isolation_level="AUTOCOMMIT"
+            )
+            self._read_only_pool = PoolMonitor(self._read_only_async_engine)
+        """Read-only session is autocommit through the AUTOCOMMIT isolation level"""
         """autoflush=False: disable autoflush for more control"""
         self._read_only_async_session = async_sessionmaker(
             bind=self._read_only_async_engine,
             expire_on_commit=False,
-            autocommit=True,
             autoflush=False,
         )
+        # a server-side cursor needs a transaction, which cannot be chained
+        # onto the AUTOCOMMIT options of a shared pool, so there it is built
+        # from the writer engine
+        streaming_engine = (
+            self._write_and_read_async_engine
+            if share_pool
+            else self._read_only_async_engine
+        )
+        self._streaming_async_session = async_sessionmaker(
+            bind=streaming_engine.execution_options(**STREAMING_EXECUTION_OPTIONS),
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+        self._replicas = ReplicaSet(
+            replicas=[
+                Replica(
+                    name=f"replica_{index}",
+                    engine=create_engine(url=replica_url, isolation_level="AUTOCOMMIT"),
+                )
+                for index, replica_url in enumerate(replica_urls)
+            ],
+            balancing=settings.POSTGRES_REPLICA_BALANCING,
+            max_lag_seconds=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+            check_interval=settings.POSTGRES_REPLICA_CHECK_INTERVAL_SECONDS,
+        )
+        self._replica_pools = {
+            replica.name: PoolMonitor(replica.engine)
+            for replica in self._replicas.replicas
+        }
+
+        if settings.METRICS_ENABLED:
+            if self._read_only_pool is self._write_and_read_pool:
+                instrument_engine(
+                    self._write_and_read_async_engine, "write_and_read", "read_only"
+                )
+            else:
+                instrument_engine(self._write_and_read_async_engine, "write_and_read")
+                instrument_engine(self._read_only_async_engine, "read_only")
+            for replica in self._replicas.replicas:
+                instrument_engine(replica.engine, replica.name)
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        engines = [self._write_and_read_async_engine]
+        if self._read_only_pool is not self._write_and_read_pool:
+            engines.append(self._read_only_async_engine)
+        engines.extend(replica.engine for replica in self._replicas.replicas)
+        return engines
+
+    async def warm_up(self, connections: int, statements: list[Executable]) -> None:
+        """Open up to ``connections`` pooled connections per engine and run
+        ``statements`` on each of them.
+
+        TCP, TLS and auth handshakes and statement preparation then happen
+        before the first request instead of during it. Replicas are warmed on a
+        best-effort basis and checked for lag so they can serve right away.
+        """
+
+        async def warm(engine: AsyncEngine) -> None:
+            async with engine.connect() as connection:
+                for statement in statements:
+                    await connection.execute(statement)
+                await connection.rollback()
+
+        def connect(engine: AsyncEngine) -> list:
+            return [warm(engine) for _ in range(min(connections, engine.pool.size()))]
+
+        primary = [self._write_and_read_async_engine]
+        if self._read_only_pool is not self._write_and_read_pool:
+            primary.append(self._read_only_async_engine)
+        await asyncio.gather(*(task for engine in primary for task in connect(engine)))
+        await self._replicas.check()
+        await asyncio.gather(
+            *(
+                task
+                for replica in self._replicas.replicas
+                if replica.healthy
+                for task in connect(replica.engine)
+            ),
+            return_exceptions=True,
+        )
+
+    async def dispose(self) -> None:
+        """Close every pooled connection, checked out ones as they come back"""
+        await self._replicas.close()
+        await asyncio.gather(*(engine.dispose() for engine in self.engines))
+
+    def pool_stats(self) -> dict[str, PoolStats]:
+        stats = {"write_and_read": self._write_and_read_pool.stats}
+        if self._read_only_pool is not self._write_and_read_pool:
+            stats["read_only"] = self._read_only_pool.stats
+        for name, monitor in self._replica_pools.items():
+            stats[name] = monitor.stats
+        return stats
 
     @asynccontextmanager
     async def get_write_and_read_session(self) -> AsyncGenerator[AsyncSession, Any]:
         session: AsyncSession = self._write_and_read_async_session()
         try:
+            await self._write_and_read_pool.acquire(session)
             yield session
         except SQLAlchemyError:
             await session.rollback()
@@ -44,12 +231,49 @@ class Database:
         finally:
             await session.close()
 
-    @asynccontextmanager
-    async def get_read_only_session(self) -> AsyncGenerator[AsyncSession, Any]:
-        session: AsyncSession = self._read_only_async_session()
+    async def _open_read_only_session(
+        self, read_your_writes: bool, streaming: bool = False
+    ) -> AsyncSession:
+        replica = None if read_your_writes else self._replicas.choose()
+        if replica is not None:
+            session: AsyncSession = (
+                replica.streaming_session() if streaming else replica.session()
+            )
+            try:
+                await self._replica_pools[replica.name].acquire(session)
+                return session
+            except (SQLAlchemyError, OSError):
+                """Unreachable replica: eject it and fall back to the primary"""
+                await session.close()
+                replica.eject()
+        session = (
+            self._streaming_async_session()
+            if streaming
+            else self._read_only_async_session()
+        )
         try:
-            yield session
+            await self._read_only_pool.acquire(session)
         except SQLAlchemyError:
+            await session.close()
             raise
+        return session
+
+    @asynccontextmanager
+    async def get_read_only_session(
+        self, read_your_writes: bool = False
+    ) -> AsyncGenerator[AsyncSession, Any]:
+        """read_your_writes=True always reads from the primary"""
+        session = await self._open_read_only_session(read_your_writes)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def get_streaming_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """Read-only transaction for server-side cursors (stream/yield_per)"""
+        session = await self._open_read_only_session(False, streaming=True)
+        try:
+            yield session
         finally:
             await session.close()
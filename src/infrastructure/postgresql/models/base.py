@@ -1,11 +1,13 @@
 from datetime import datetime
 from typing import Annotated
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlalchemy import MetaData, func
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, mapped_column
 
+from src.helper.uuid import uuid7
+
 
 class BaseORM(AsyncAttrs, DeclarativeBase):
     metadata = MetaData(
@@ -19,9 +21,7 @@ class BaseORM(AsyncAttrs, DeclarativeBase):
     )
 
 
-uuidpk = Annotated[
-    UUID, mapped_column(primary_key=True, unique=True, nullable=False, default=uuid4)
-]
+uuidpk = Annotated[UUID, mapped_column(primary_key=True, nullable=False, default=uuid7)]
 created_at = Annotated[
     datetime, mapped_column(default=func.now(), server_default=func.now())
 ]
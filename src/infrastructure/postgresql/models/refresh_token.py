@@ -0,0 +1,26 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.postgresql.models.base import BaseORM, created_at, uuidpk
+
+
+class RefreshTokenORM(BaseORM):
+    __tablename__ = "refresh_token"
+    oid: Mapped[uuidpk]
+    user_oid: Mapped[UUID] = mapped_column(
+        ForeignKey("user.oid", ondelete="CASCADE"), index=True, nullable=False
+    )
+    """sha256 of the token, the token itself is never stored"""
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32), unique=True, nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    revoked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    created_at: Mapped[created_at]
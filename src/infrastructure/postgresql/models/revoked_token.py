@@ -0,0 +1,24 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.postgresql.models.base import BaseORM
+
+
+class RevokedTokenORM(BaseORM):
+    __tablename__ = "revoked_token"
+    """jti claim of the revoked access token"""
+    jti: Mapped[UUID] = mapped_column(primary_key=True, nullable=False)
+    """exp claim of the token, the row is useless afterwards"""
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        index=True,
+        nullable=False,
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.domain.user.entities import User
@@ -22,7 +22,10 @@ class UserORM(BaseORM):
     @staticmethod
     def from_entity(entity: User) -> "UserORM":
         return UserORM(
-            email=entity.email, username=entity.username, password=entity.password
+            oid=entity.oid,
+            email=entity.email,
+            username=entity.username,
+            password=entity.password,
         )
 
     def to_entity(self) -> User:
@@ -34,3 +37,6 @@ class UserORM(BaseORM):
             created_at=self.created_at,
             updated_at=self.updated_at,
         )
+
+
+Index("ix_user_email_lower", func.lower(UserORM.email), unique=True)
@@ -0,0 +1,43 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Insert, Select, Update, func, insert, select, update
+
+from src.infrastructure.postgresql.models.refresh_token import RefreshTokenORM
+
+
+def insert_refresh_token(
+    user_oid: UUID, token_hash: bytes, expires_at: datetime
+) -> Insert:
+    return insert(RefreshTokenORM).values(
+        user_oid=user_oid, token_hash=token_hash, expires_at=expires_at
+    )
+
+
+def revoke_active_refresh_token(token_hash: bytes) -> Update:
+    return (
+        update(RefreshTokenORM)
+        .where(
+            RefreshTokenORM.token_hash == token_hash,
+            RefreshTokenORM.revoked_at.is_(None),
+            RefreshTokenORM.expires_at > func.now(),
+        )
+        .values(revoked_at=func.now())
+        .returning(RefreshTokenORM.user_oid)
+    )
+
+
+def select_refresh_token_owner(token_hash: bytes) -> Select:
+    return select(RefreshTokenORM.user_oid).where(
+        RefreshTokenORM.token_hash == token_hash
+    )
+
+
+def revoke_user_refresh_tokens(user_oid: UUID) -> Update:
+    return (
+        update(RefreshTokenORM)
+        .where(
+            RefreshTokenORM.user_oid == user_oid, RefreshTokenORM.revoked_at.is_(None)
+        )
+        .values(revoked_at=func.now())
+    )
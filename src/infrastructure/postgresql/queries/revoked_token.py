@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Delete, Insert, Select, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.infrastructure.postgresql.models.revoked_token import RevokedTokenORM
+
+
+def insert_revoked_token(jti: UUID, expires_at: datetime) -> Insert:
+    return (
+        insert(RevokedTokenORM)
+        .values(jti=jti, expires_at=expires_at)
+        .on_conflict_do_nothing(index_elements=[RevokedTokenORM.jti])
+    )
+
+
+def select_revoked_token(jti: UUID) -> Select:
+    return select(RevokedTokenORM.jti).where(
+        RevokedTokenORM.jti == jti, RevokedTokenORM.expires_at > func.now()
+    )
+
+
+def select_revoked_tokens_since(since: datetime | None) -> Select:
+    query = select(RevokedTokenORM.jti, RevokedTokenORM.revoked_at).where(
+        RevokedTokenORM.expires_at > func.now()
+    )
+    if since is not None:
+        query = query.where(RevokedTokenORM.revoked_at > since)
+    return query.order_by(RevokedTokenORM.revoked_at)
+
+
+def delete_expired_revoked_tokens() -> Delete:
+    return delete(RevokedTokenORM).where(RevokedTokenORM.expires_at <= func.now())
@@ -0,0 +1,103 @@
+from uuid import UUID
+
+from sqlalchemy import (
+    Delete,
+    Select,
+    String,
+    Update,
+    Uuid,
+    any_,
+    bindparam,
+    delete,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
+
+from src.domain.user.entities import User
+from src.infrastructure.postgresql.models.user import UserORM
+
+# table columns in User field order, so a row unpacks straight into User(*row)
+USER_COLUMNS = tuple(
+    UserORM.__table__.c[name]
+    for name in ("oid", "created_at", "updated_at", "email", "username", "password")
+)
+
+
+def select_user(orm: bool = False) -> Select:
+    """Core select of USER_COLUMNS, or of UserORM instances with ``orm``"""
+    return select(UserORM) if orm else select(*USER_COLUMNS)
+
+
+def select_user_by_username(username: str, orm: bool = False) -> Select:
+    return select_user(orm).where(UserORM.username == username).limit(1)
+
+
+def select_user_by_email(email: str, orm: bool = False) -> Select:
+    """lower(email) is what ix_user_email_lower covers"""
+    return select_user(orm).where(func.lower(UserORM.email) == email.lower()).limit(1)
+
+
+def select_user_by_oid(oid: UUID | str, orm: bool = False) -> Select:
+    return select_user(orm).where(UserORM.oid == oid).limit(1)
+
+
+def select_users_by_oids(oids: list[UUID], orm: bool = False) -> Select:
+    return select_user(orm).where(
+        UserORM.oid == any_(bindparam("oids", oids, type_=ARRAY(Uuid)))
+    )
+
+
+def select_users(orm: bool = False) -> Select:
+    return select_user(orm).order_by(UserORM.oid)
+
+
+def select_users_page(after: UUID | None, limit: int, orm: bool = False) -> Select:
+    stmt = select_users(orm).limit(limit)
+    if after is not None:
+        stmt = stmt.where(UserORM.oid > after)
+    return stmt
+
+
+def select_existing_usernames_and_emails(
+    usernames: list[str], emails: list[str]
+) -> Select:
+    return select(UserORM.username, UserORM.email).where(
+        or_(
+            UserORM.username
+            == any_(bindparam("usernames", usernames, type_=ARRAY(String))),
+            func.lower(UserORM.email)
+            == any_(
+                bindparam(
+                    "emails", [email.lower() for email in emails], type_=ARRAY(String)
+                )
+            ),
+        )
+    )
+
+
+def insert_user(user: User) -> Insert:
+    values = {"email": user.email, "username": user.username, "password": user.password}
+    if user.oid is not None:
+        values["oid"] = user.oid
+    return (
+        insert(UserORM.__table__)
+        .values(values)
+        .on_conflict_do_nothing()
+        .returning(*USER_COLUMNS)
+    )
+
+
+def update_user(user: User) -> Update:
+    return (
+        update(UserORM.__table__)
+        .where(UserORM.oid == user.oid)
+        .values(email=user.email, username=user.username, password=user.password)
+        .returning(*USER_COLUMNS)
+    )
+
+
+def delete_user(oid: UUID | str) -> Delete:
+    return delete(UserORM.__table__).where(UserORM.oid == oid).returning(*USER_COLUMNS)
@@ -0,0 +1,36 @@
+from uuid import UUID
+
+from sqlalchemy import Executable
+
+from src.infrastructure.postgresql.queries.refresh_token import (
+    select_refresh_token_owner,
+)
+from src.infrastructure.postgresql.queries.revoked_token import select_revoked_token
+from src.infrastructure.postgresql.queries.user import (
+    select_existing_usernames_and_emails,
+    select_user_by_email,
+    select_user_by_oid,
+    select_user_by_username,
+    select_users_page,
+)
+
+NIL_UUID = UUID(int=0)
+
+
+def warm_up_statements() -> list[Executable]:
+    """Hot read statements, with parameters that match no row.
+
+    asyncpg prepares a statement per connection on first execution, so running
+    these on every pooled connection at startup takes preparation off the
+    first requests.
+    """
+    return [
+        select_user_by_oid(NIL_UUID),
+        select_user_by_username(""),
+        select_user_by_email(""),
+        select_users_page(None, 1),
+        select_users_page(NIL_UUID, 1),
+        select_existing_usernames_and_emails([""], [""]),
+        select_refresh_token_owner(bytes(32)),
+        select_revoked_token(NIL_UUID),
+    ]
@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import math
+import time
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+# 0 when the replica has replayed everything it received, so an idle primary
+# does not look like lag
+REPLICATION_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+# server-side cursors only live inside a transaction, AUTOCOMMIT has none
+STREAMING_EXECUTION_OPTIONS = {
+    "isolation_level": "REPEATABLE READ",
+    "postgresql_readonly": True,
+}
+
+Balancing = Literal["round_robin", "least_connections"]
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine) -> None:
+        self.name = name
+        self.engine = engine
+        self.session = async_sessionmaker(
+            bind=engine, expire_on_commit=False, autoflush=False
+        )
+        self.streaming_session = async_sessionmaker(
+            bind=engine.execution_options(**STREAMING_EXECUTION_OPTIONS),
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        self.healthy = False
+        self.lag_seconds: float | None = None
+
+    def eject(self) -> None:
+        self.healthy = False
+
+    async def check(self, max_lag_seconds: float, timeout: float) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as connection:
+                    lag = await connection.scalar(REPLICATION_LAG_QUERY)
+        except (SQLAlchemyError, OSError, TimeoutError):
+            self.lag_seconds = None
+            self.healthy = False
+            return
+        self.lag_seconds = float(lag)
+        self.healthy = self.lag_seconds <= max_lag_seconds
+
+
+class ReplicaSet:
+    """Balances read-only sessions across healthy replicas.
+
+    Health and replication lag are re-checked in the background at most once per
+    ``check_interval``; replicas start ejected until their first check passes.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        balancing: Balancing,
+        max_lag_seconds: float,
+        check_interval: float,
+    ) -> None:
+        self.replicas = replicas
+        self._balancing = balancing
+        self._max_lag_seconds = max_lag_seconds
+        self._check_interval = check_interval
+        self._counter = itertools.count()
+        self._checked_at = -math.inf
+        self._check_task: asyncio.Task | None = None
+
+    def choose(self) -> Replica | None:
+        if not self.replicas:
+            return None
+        self._schedule_check()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self._balancing == "least_connections":
+            return min(healthy, key=lambda replica: replica.engine.pool.checkedout())
+        return healthy[next(self._counter) % len(healthy)]
+
+    def _schedule_check(self) -> None:
+        if self._check_task is not None and not self._check_task.done():
+            return
+        if time.monotonic() - self._checked_at < self._check_interval:
+            return
+        self._checked_at = time.monotonic()
+        self._check_task = asyncio.create_task(self.check())
+
+    async def close(self) -> None:
+        if self._check_task is not None and not self._check_task.done():
+            self._check_task.cancel()
+            await asyncio.gather(self._check_task, return_exceptions=True)
+
+    async def check(self) -> None:
+        await asyncio.gather(
+            *(
+                replica.check(self._max_lag_seconds, self._check_interval)
+                for replica in self.replicas
+            )
+        )
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.queries.refresh_token import (
+    insert_refresh_token,
+    revoke_active_refresh_token,
+    revoke_user_refresh_tokens,
+    select_refresh_token_owner,
+)
+
+
+class IRefreshTokenRepository(ABC):
+    @abstractmethod
+    async def create(
+        self, user_oid: UUID, token_hash: bytes, expires_at: datetime
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def rotate(
+        self, token_hash: bytes, new_token_hash: bytes, expires_at: datetime
+    ) -> UUID | None:
+        pass
+
+    @abstractmethod
+    async def revoke(self, token_hash: bytes) -> UUID | None:
+        pass
+
+
+@dataclass(frozen=True)
+class PostgresRefreshTokenRepository(IRefreshTokenRepository):
+    database: Database
+
+    async def create(
+        self, user_oid: UUID, token_hash: bytes, expires_at: datetime
+    ) -> None:
+        async with self.database.get_write_and_read_session() as session:
+            await session.execute(
+                insert_refresh_token(user_oid, token_hash, expires_at)
+            )
+            await session.commit()
+
+    async def rotate(
+        self, token_hash: bytes, new_token_hash: bytes, expires_at: datetime
+    ) -> UUID | None:
+        """Revoke the presented token and issue its successor in one transaction.
+
+        A token that exists but is no longer active has been used before, so
+        every token of its owner is revoked and None is returned.
+        """
+        async with self.database.get_write_and_read_session() as session:
+            user_oid = await session.scalar(revoke_active_refresh_token(token_hash))
+            if user_oid is None:
+                owner = await session.scalar(select_refresh_token_owner(token_hash))
+                if owner is not None:
+                    await session.execute(revoke_user_refresh_tokens(owner))
+                await session.commit()
+                return None
+            await session.execute(
+                insert_refresh_token(user_oid, new_token_hash, expires_at)
+            )
+            await session.commit()
+            return user_oid
+
+    async def revoke(self, token_hash: bytes) -> UUID | None:
+        async with self.database.get_write_and_read_session() as session:
+            user_oid = await session.scalar(revoke_active_refresh_token(token_hash))
+            await session.commit()
+            return user_oid
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.queries.revoked_token import (
+    delete_expired_revoked_tokens,
+    insert_revoked_token,
+    select_revoked_token,
+    select_revoked_tokens_since,
+)
+
+
+class IRevokedTokenRepository(ABC):
+    @abstractmethod
+    async def create(self, jti: UUID, expires_at: datetime) -> None:
+        pass
+
+    @abstractmethod
+    async def exists(self, jti: UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_revoked_since(
+        self, since: datetime | None
+    ) -> list[tuple[UUID, datetime]]:
+        pass
+
+    @abstractmethod
+    async def delete_expired(self) -> int:
+        pass
+
+
+@dataclass(frozen=True)
+class PostgresRevokedTokenRepository(IRevokedTokenRepository):
+    database: Database
+
+    async def create(self, jti: UUID, expires_at: datetime) -> None:
+        async with self.database.get_write_and_read_session() as session:
+            await session.execute(insert_revoked_token(jti, expires_at))
+            await session.commit()
+
+    async def exists(self, jti: UUID) -> bool:
+        # read-your-writes: a revocation must be visible as soon as it returns
+        async with self.database.get_read_only_session(
+            read_your_writes=True
+        ) as session:
+            return await session.scalar(select_revoked_token(jti)) is not None
+
+    async def get_revoked_since(
+        self, since: datetime | None
+    ) -> list[tuple[UUID, datetime]]:
+        async with self.database.get_read_only_session(
+            read_your_writes=True
+        ) as session:
+            result = await session.execute(select_revoked_tokens_since(since))
+            return [tuple(row) for row in result]
+
+    async def delete_expired(self) -> int:
+        async with self.database.get_write_and_read_session() as session:
+            result = await session.execute(delete_expired_revoked_tokens())
+            await session.commit()
+            return result.rowcount
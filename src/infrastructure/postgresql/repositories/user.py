@@ -1,79 +1,206 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import Executable, Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config.settings import get_settings
+from src.domain.user.entities import User
+from src.helper.uuid import uuid7
 from src.infrastructure.postgresql.database import Database
-from src.infrastructure.postgresql.models.user import UserORM
+from src.infrastructure.postgresql.queries.user import (
+    delete_user,
+    insert_user,
+    select_existing_usernames_and_emails,
+    select_user_by_email,
+    select_user_by_oid,
+    select_user_by_username,
+    select_users,
+    select_users_by_oids,
+    select_users_page,
+    update_user,
+)
 
 
 class IUserRepository(ABC):
     @abstractmethod
     async def get_by_username_or_email(
-        self, username: str | None = None, email: str | None = None
-    ) -> UserORM | None:
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        read_your_writes: bool = False,
+    ) -> User | None:
         pass
 
     @abstractmethod
-    async def get_by_oid(self, oid: str) -> UserORM | None:
+    async def get_by_oid(self, oid: str, read_your_writes: bool = False) -> User | None:
         pass
 
     @abstractmethod
-    async def get_all_users(self) -> list[UserORM]:
+    async def get_by_oids(self, oids: list[UUID]) -> list[User]:
         pass
 
     @abstractmethod
-    async def create(self, user: UserORM) -> UserORM:
+    async def get_users_page(self, after: UUID | None, limit: int) -> list[User]:
         pass
 
     @abstractmethod
-    async def update(self, user: UserORM) -> UserORM:
+    def stream_users(self, batch_size: int) -> AsyncIterator[User]:
         pass
 
     @abstractmethod
-    async def delete(self, oid: str) -> None:
+    async def get_existing_usernames_and_emails(
+        self, usernames: list[str], emails: list[str]
+    ) -> list[tuple[str, str]]:
+        pass
+
+    @abstractmethod
+    async def create(self, user: User) -> User | None:
+        pass
+
+    @abstractmethod
+    async def bulk_create(self, users: list[User]) -> list[str]:
+        pass
+
+    @abstractmethod
+    async def update(self, user: User) -> User | None:
+        pass
+
+    @abstractmethod
+    async def delete(self, oid: str) -> User | None:
         pass
 
 
 @dataclass(frozen=True)
 class PostgresUserRepository(IUserRepository):
+    """Reads build ``User`` entities straight from Core result rows.
+
+    No ORM instance, identity map entry or attribute instrumentation is created
+    per row; USER_READ_MODE=orm switches reads back to ``UserORM`` for
+    comparison. Writes are single Core statements returning the same columns.
+    """
+
     database: Database
 
-    async def get_by_username_or_email(
-        self, username: str | None = None, email: str | None = None
-    ) -> UserORM | None:
-        key = username if username else email
-        key_orm = UserORM.username if username else UserORM.email
-        stmt = select(UserORM).where(key_orm == key).limit(1)
-        async with self.database.get_read_only_session() as session:
-            return await session.scalar(stmt)
+    @staticmethod
+    def _orm() -> bool:
+        return get_settings().USER_READ_MODE == "orm"
 
-    async def get_by_oid(self, oid: str) -> UserORM | None:
-        stmt = select(UserORM).where(UserORM.oid == oid).limit(1)
-        async with self.database.get_read_only_session() as session:
-            return await session.scalar(stmt)
+    @staticmethod
+    async def _one(session: AsyncSession, stmt: Select, orm: bool) -> User | None:
+        if orm:
+            user = await session.scalar(stmt)
+            return user.to_entity() if user is not None else None
+        connection = await session.connection()
+        row = (await connection.execute(stmt)).first()
+        return User(*row) if row is not None else None
 
-    async def get_all_users(self) -> list[UserORM]:
-        stmt = select(UserORM).order_by(UserORM.oid)
+    async def get_by_username_or_email(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        read_your_writes: bool = False,
+    ) -> User | None:
+        orm = self._orm()
+        stmt = (
+            select_user_by_username(username, orm)
+            if username
+            else select_user_by_email(email, orm)
+        )
+        async with self.database.get_read_only_session(read_your_writes) as session:
+            return await self._one(session, stmt, orm)
+
+    async def get_by_oid(self, oid: str, read_your_writes: bool = False) -> User | None:
+        orm = self._orm()
+        async with self.database.get_read_only_session(read_your_writes) as session:
+            return await self._one(session, select_user_by_oid(oid, orm), orm)
+
+    @staticmethod
+    async def _all(session: AsyncSession, stmt: Select, orm: bool) -> list[User]:
+        if orm:
+            return [user.to_entity() for user in await session.scalars(stmt)]
+        connection = await session.connection()
+        return [User(*row) for row in await connection.execute(stmt)]
+
+    async def get_by_oids(self, oids: list[UUID]) -> list[User]:
+        orm = self._orm()
         async with self.database.get_read_only_session() as session:
-            return await session.scalars(stmt).all()
+            return await self._all(session, select_users_by_oids(oids, orm), orm)
 
-    async def create(self, user: UserORM) -> UserORM:
+    async def get_users_page(self, after: UUID | None, limit: int) -> list[User]:
+        orm = self._orm()
+        async with self.database.get_read_only_session() as session:
+            return await self._all(session, select_users_page(after, limit, orm), orm)
+
+    async def stream_users(self, batch_size: int) -> AsyncIterator[User]:
+        orm = self._orm()
+        stmt = select_users(orm).execution_options(yield_per=batch_size)
+        async with self.database.get_streaming_session() as session:
+            if orm:
+                async for user in await session.stream_scalars(stmt):
+                    yield user.to_entity()
+                return
+            connection = await session.connection()
+            async for row in await connection.stream(stmt):
+                yield User(*row)
+
+    async def get_existing_usernames_and_emails(
+        self, usernames: list[str], emails: list[str]
+    ) -> list[tuple[str, str]]:
+        stmt = select_existing_usernames_and_emails(usernames, emails)
+        async with self.database.get_read_only_session(
+            read_your_writes=True
+        ) as session:
+            return [tuple(row) for row in await session.execute(stmt)]
+
+    async def _write(self, stmt: Executable) -> User | None:
         async with self.database.get_write_and_read_session() as session:
-            session.add(user)
+            connection = await session.connection()
+            row = (await connection.execute(stmt)).first()
             await session.commit()
-            await session.refresh(user)
-            return user
-
-    async def update(self, user: UserORM) -> UserORM:
+            return User(*row) if row is not None else None
+
+    async def create(self, user: User) -> User | None:
+        """None when the username or email is taken"""
+        return await self._write(insert_user(user))
+
+    async def bulk_create(self, users: list[User]) -> list[str]:
+        """COPY into a temporary table, then move the rows over with ON CONFLICT
+        DO NOTHING so rows registered concurrently are skipped, not fatal.
+        Returns the usernames that were inserted."""
+        records = [
+            (user.oid or uuid7(), user.email, user.username, user.password)
+            for user in users
+        ]
         async with self.database.get_write_and_read_session() as session:
-            await session.merge(user)
+            await session.execute(
+                text(
+                    'CREATE TEMPORARY TABLE user_import (LIKE "user" INCLUDING DEFAULTS)'
+                    " ON COMMIT DROP"
+                )
+            )
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                "user_import",
+                records=records,
+                columns=["oid", "email", "username", "password"],
+            )
+            result = await session.execute(
+                text(
+                    'INSERT INTO "user" (oid, email, username, password)'
+                    " SELECT oid, email, username, password FROM user_import"
+                    " ON CONFLICT DO NOTHING RETURNING username"
+                )
+            )
+            inserted = list(result.scalars())
             await session.commit()
-            await session.refresh(user)
-            return user
+            return inserted
 
-    async def delete(self, oid: str) -> None:
-        stmt = delete(UserORM).where(UserORM.oid == oid).limit(1)
-        async with self.databae.get_write_and_read_session() as session:
-            await session.execute(stmt)
-            await session.commit()
+    async def update(self, user: User) -> User | None:
+        return await self._write(update_user(user))
+
+    async def delete(self, oid: str) -> User | None:
+        return await self._write(delete_user(oid))
@@ -0,0 +1,189 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from src.helper.admission import AdmissionController, AdmissionStats
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+CALIBRATION_PASSWORD = "Calibrate#2024"
+
+
+@lru_cache
+def get_crypt_context(rounds: int | None = None, tolerance: int = 0) -> "CryptContext":
+    # passlib and bcrypt are only needed in the hashing worker processes
+    from passlib.context import CryptContext
+
+    if rounds is None:
+        return CryptContext(schemes=["bcrypt"])
+    # min/max bound the cost so hashes outside rounds +- tolerance are flagged
+    # for rehash
+    return CryptContext(
+        schemes=["bcrypt"],
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds - tolerance,
+        bcrypt__max_rounds=rounds + tolerance,
+    )
+
+
+def hash_password(
+    plain_password: str, rounds: int | None = None, tolerance: int = 0
+) -> str:
+    return get_crypt_context(rounds, tolerance).hash(plain_password)
+
+
+def verify_password(
+    plain_password: str,
+    hash_password: str,
+    rounds: int | None = None,
+    tolerance: int = 0,
+) -> bool:
+    return get_crypt_context(rounds, tolerance).verify(plain_password, hash_password)
+
+
+def verify_and_update_password(
+    plain_password: str,
+    hash_password: str,
+    rounds: int | None = None,
+    tolerance: int = 0,
+) -> tuple[bool, str | None]:
+    return get_crypt_context(rounds, tolerance).verify_and_update(
+        plain_password, hash_password
+    )
+
+
+def hash_passwords(
+    plain_passwords: list[str], rounds: int | None = None, tolerance: int = 0
+) -> list[str]:
+    context = get_crypt_context(rounds, tolerance)
+    return [context.hash(plain_password) for plain_password in plain_passwords]
+
+
+def calibrate_rounds(
+    target_seconds: float, min_rounds: int, max_rounds: int, samples: int = 3
+) -> int:
+    """Pick the bcrypt cost whose verify time is closest to ``target_seconds``.
+
+    Every extra round doubles the work, so one measurement at ``min_rounds`` is
+    enough to extrapolate.
+    """
+    context = get_crypt_context(min_rounds)
+    hashed = context.hash(CALIBRATION_PASSWORD)
+    elapsed = math.inf
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(CALIBRATION_PASSWORD, hashed)
+        elapsed = min(elapsed, time.perf_counter() - started)
+    rounds = min_rounds + round(math.log2(target_seconds / elapsed))
+    return max(min_rounds, min(max_rounds, rounds))
+
+
+def warm_up_worker(rounds: int | None = None, tolerance: int = 0) -> int:
+    get_crypt_context(rounds, tolerance)
+    return os.getpid()
+
+
+class PasswordHashingPool:
+    """Runs bcrypt in worker processes so the event loop never blocks on it.
+
+    Only as many jobs as there are workers are handed to the executor, the rest
+    wait in the admission queue where their depth and queue time are bounded.
+
+    A calibrated cost accepts hashes one round either side of it: every server
+    process calibrates on its own, and processes landing on neighbouring costs
+    would otherwise rehash the same user back and forth on each login.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_queue_size: int = 256,
+        max_wait_seconds: float = 2.0,
+        rounds: int | None = None,
+    ) -> None:
+        self.rounds = rounds
+        self.tolerance = 0
+        max_workers = max_workers or os.cpu_count() or 1
+        self.max_workers = max_workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._admission = AdmissionController(
+            max_concurrency=max_workers,
+            max_queue_size=max_queue_size,
+            max_wait_seconds=max_wait_seconds,
+        )
+
+    @property
+    def stats(self) -> AdmissionStats:
+        return self._admission.stats
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        async with self._admission.admit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def calibrate(
+        self, target_seconds: float, min_rounds: int, max_rounds: int
+    ) -> int:
+        self.rounds = await self.run(
+            calibrate_rounds, target_seconds, min_rounds, max_rounds
+        )
+        self.tolerance = 1
+        return self.rounds
+
+    async def warm_up(self) -> int:
+        """Spawn every worker and import passlib in it, returns the worker count"""
+        pids = await asyncio.gather(
+            *(
+                self.run(warm_up_worker, self.rounds, self.tolerance)
+                for _ in range(self.max_workers)
+            )
+        )
+        return len(set(pids))
+
+    async def hash(self, plain_password: str) -> str:
+        return await self.run(
+            hash_password, plain_password, self.rounds, self.tolerance
+        )
+
+    async def hash_many(self, plain_passwords: list[str]) -> list[str]:
+        """One chunk per worker, so every chunk is admitted without queueing"""
+        chunk_size = -(-len(plain_passwords) // self.max_workers) or 1
+        chunks = [
+            plain_passwords[start : start + chunk_size]
+            for start in range(0, len(plain_passwords), chunk_size)
+        ]
+        hashed = await asyncio.gather(
+            *(
+                self.run(hash_passwords, chunk, self.rounds, self.tolerance)
+                for chunk in chunks
+            )
+        )
+        return [hash_password for chunk in hashed for hash_password in chunk]
+
+    async def verify(self, plain_password: str, hash_password: str) -> bool:
+        return await self.run(
+            verify_password, plain_password, hash_password, self.rounds, self.tolerance
+        )
+
+    async def verify_and_update(
+        self, plain_password: str, hash_password: str
+    ) -> tuple[bool, str | None]:
+        return await self.run(
+            verify_and_update_password,
+            plain_password,
+            hash_password,
+            self.rounds,
+            self.tolerance,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
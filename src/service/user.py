@@ -1,20 +1,27 @@
+import asyncio
+import hashlib
+import math
 import random
 import re
-from dataclasses import Field, dataclass
-from datetime import datetime, timedelta
+import secrets
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
 
-from jose import jwt
-from passlib.context import CryptContext
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+from sqlalchemy.exc import SQLAlchemyError
 
-from src.core.config.settings import settings
+from src.core.config.settings import get_settings
+from src.domain.base.pagination import Page, decode_cursor, encode_cursor
 from src.domain.user.entities import User
 from src.domain.user.errors import (
     CodeHasExpiredException,
-    CodeIsNotMatch,
+    CodeIsNotMatchException,
     DataVerifyAreNotFoundException,
     PasswordInvalidException,
+    TokenInvalidException,
+    UserIsExsitedException,
     UserIsNotFoundException,
 )
 from src.domain.user.services import (
@@ -22,13 +29,39 @@ from src.domain.user.services import (
     ICodeService,
     ILoginService,
     IPasswordService,
+    IRefreshTokenService,
+    ISendCodeService,
+    ITokenRevocationService,
+    ITokenService,
+    IUserLoader,
     IUserService,
 )
+from src.domain.user.value_objects import TokenClaims
+from src.helper.batch_loader import BatchLoader
+from src.helper.bloom import BloomFilter
 from src.helper.errors import fail
-from src.infrastructure.postgresql.models.user import UserORM
+from src.helper.lru import CacheStats, LRUCache
+from src.helper.metrics import (
+    EMAIL_ENQUEUE,
+    PASSWORD_HASH,
+    PASSWORD_HASH_MANY,
+    PASSWORD_VERIFY,
+    PASSWORD_VERIFY_AND_UPDATE,
+    TOKEN_ENCODE,
+    TOKEN_VERIFY,
+)
+from src.helper.uuid import uuid7
+from src.infrastructure.cache.code import ICodeStore
+from src.infrastructure.email.dispatcher import EmailMessage, IEmailDispatcher
+from src.infrastructure.postgresql.repositories.refresh_token import (
+    IRefreshTokenRepository,
+)
+from src.infrastructure.postgresql.repositories.revoked_token import (
+    IRevokedTokenRepository,
+)
 from src.infrastructure.postgresql.repositories.user import IUserRepository
+from src.service.hashing import PasswordHashingPool
 
-pwd_context = CryptContext(schemes=["bcrypt"])
 
 class GoogleAuthentication(IAuthAvailableAreProvidedService):
     def get_user_by_auth_provider(self, token: str):
@@ -37,65 +70,78 @@ class GoogleAuthentication(IAuthAvailableAreProvidedService):
         # }
         pass
 
+
 class AppleAuthentication(IAuthAvailableAreProvidedService):
     pass
 
-@dataclass
+
+# expired codes are kept a little longer so they fail as expired, not as missing
+EXPIRED_CODE_RETENTION = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
 class CodeService(ICodeService):
-    cache: dict = Field(default_factory=dict)
+    store: ICodeStore
 
-    def generate_code(self, email: str | None = None, username: str | None = None, expire_delta: timedelta | None = None) -> str:
+    async def generate_code(
+        self, email: str, expire_delta: timedelta | None = None
+    ) -> str:
         code = str(random.randint(100000, 999999))
-        if expire_delta:
-            expire = datetime.now() + expire_delta
-        else:
-            expire = datetime.now() + timedelta(minutes=5)
-        data = {
-            "code": code,
-            "expire": expire
-        }
-        key = username if username else email
-        self.cache[key] = data
+        expire_delta = expire_delta or timedelta(minutes=5)
+        expire = datetime.now().timestamp() + expire_delta.total_seconds()
+        await self.store.set(
+            email,
+            f"{code}:{expire}",
+            (expire_delta + EXPIRED_CODE_RETENTION).total_seconds(),
+        )
         return code
 
-    def validate_code(self, code: str, email: str | None = None, username: str | None = None) -> bool:
-        key = username if username else email
-        data = self.cache.get(key)
+    async def validate_code(self, email: str, code: str) -> bool:
+        data = await self.store.pop(email)
         if not data:
             fail(DataVerifyAreNotFoundException)
-        elif code != data.get("code"):
-            del self.cache[key]
-            fail(CodeIsNotMatch)
-        elif datetime.now() > data.get("expire"):
-            del self.cache[key]
+        stored_code, expire = data.split(":", 1)
+        if code != stored_code:
+            fail(CodeIsNotMatchException)
+        elif datetime.now().timestamp() > float(expire):
             fail(CodeHasExpiredException)
-        del self.cache[key]
         return True
 
-class SendCodeService:
+
+OTP_EMAIL_SUBJECT = "Your OTP Verification Code"
+# one body for every recipient, the code is a per-recipient substitution so
+# codes requested together go out in one SendGrid request
+OTP_EMAIL_HTML_CONTENT = """
+    <div style="font-family: Arial, sans-serif; padding: 20px;">
+        <h2>OTP Verification</h2>
+        <p>Your OTP code is: <strong>-code-</strong></p>
+        <p>This code will expire in 10 minutes.</p>
+        <p>If you didn't request this code, please ignore this email.</p>
+    </div>
+"""
+
+
+@dataclass(frozen=True)
+class SendCodeService(ISendCodeService):
+    dispatcher: IEmailDispatcher
+
     def send_code(self, email: str, code: str) -> None:
-        """Send OTP via email using SendGrid"""
-        message = Mail(
-        from_email=settings.FROM_EMAIL,
-        to_emails=email,
-        subject='Your OTP Verification Code',
-        html_content=f'''
-            <div style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2>OTP Verification</h2>
-                <p>Your OTP code is: <strong>{code}</strong></p>
-                <p>This code will expire in 10 minutes.</p>
-                <p>If you didn't request this code, please ignore this email.</p>
-            </div>
-        '''
-    ) 
-        sg = SendGridAPIClient(
-            settings.SENDGRID_KEY
-        )
-        sg.send(message)
+        """Queue the OTP email, it is sent in the background"""
+        with EMAIL_ENQUEUE.time():
+            self.dispatcher.enqueue(
+                EmailMessage(
+                    to=email,
+                    subject=OTP_EMAIL_SUBJECT,
+                    html_content=OTP_EMAIL_HTML_CONTENT,
+                    substitutions={"-code-": code},
+                )
+            )
 
-        print(f"The code <{code}> has been sent to email <{email}>")
 
+@dataclass(frozen=True)
 class PasswordService(IPasswordService):
+    pool: PasswordHashingPool
+
     def validate_password_strength(self, plain_password: str) -> bool:
         if not 8 <= len(plain_password) <= 16:
             fail(
@@ -116,61 +162,388 @@ class PasswordService(IPasswordService):
 
         return True
 
-    def get_hash_password(self, plain_password: str) -> str:
+    async def get_hash_password_async(self, plain_password: str) -> str:
         if self.validate_password_strength(plain_password):
-            return pwd_context.hash(plain_password)
+            with PASSWORD_HASH.time():
+                return await self.pool.hash(plain_password)
+
+    async def verify_password_async(
+        self, plain_password: str, hash_password: str
+    ) -> bool:
+        if self.validate_password_strength(plain_password):
+            with PASSWORD_VERIFY.time():
+                return await self.pool.verify(plain_password, hash_password)
+
+    async def get_hash_passwords_async(self, plain_passwords: list[str]) -> list[str]:
+        for plain_password in plain_passwords:
+            self.validate_password_strength(plain_password)
+        with PASSWORD_HASH_MANY.time():
+            return await self.pool.hash_many(plain_passwords)
 
-    def verify_password(self, plain_password: str, hash_password: str) -> bool:
+    async def verify_and_update_password_async(
+        self, plain_password: str, hash_password: str
+    ) -> tuple[bool, str | None]:
         if self.validate_password_strength(plain_password):
-            return pwd_context.verify(plain_password, hash_password)
+            with PASSWORD_VERIFY_AND_UPDATE.time():
+                return await self.pool.verify_and_update(plain_password, hash_password)
 
 
 @dataclass(frozen=True)
 class UserService(IUserService):
     repository: IUserRepository
 
-    async def get_by_username_or_email(self, username: str | None = None, email: str | None = None) -> User:
-        user = await self.repository.get_by_username_or_email(username, email)
+    async def get_by_username_or_email(
+        self,
+        username: str | None = None,
+        email: str | None = None,
+        read_your_writes: bool = False,
+    ) -> User:
+        user = await self.repository.get_by_username_or_email(
+            username, email, read_your_writes
+        )
         if not user:
             fail(UserIsNotFoundException)
         return user
 
-    async def get_by_oid(self, oid: str) -> User:
-        user = await self.repository.get_by_oid(oid)
+    async def get_by_oid(self, oid: str, read_your_writes: bool = False) -> User:
+        user = await self.repository.get_by_oid(oid, read_your_writes)
         if not user:
             fail(UserIsNotFoundException)
         return user
 
+    async def get_by_oids(self, oids: list[UUID]) -> list[User]:
+        return await self.repository.get_by_oids(oids)
+
+    async def get_users_page(
+        self, cursor: str | None = None, limit: int | None = None
+    ) -> Page[User]:
+        settings = get_settings()
+        limit = min(
+            limit or settings.USER_PAGE_SIZE_DEFAULT, settings.USER_PAGE_SIZE_MAX
+        )
+        after = decode_cursor(cursor) if cursor else None
+        users = await self.repository.get_users_page(after, limit + 1)
+        next_cursor = None
+        if len(users) > limit:
+            next_cursor = encode_cursor(users[limit - 1].oid)
+        return Page(items=users[:limit], next_cursor=next_cursor)
+
+    def stream_users(self) -> AsyncIterator[User]:
+        return self.repository.stream_users(get_settings().USER_STREAM_BATCH_SIZE)
+
+    async def get_existing_usernames_and_emails(
+        self, usernames: list[str], emails: list[str]
+    ) -> list[tuple[str, str]]:
+        return await self.repository.get_existing_usernames_and_emails(
+            usernames, emails
+        )
+
     async def create(self, user: User) -> User:
-        user_orm = UserORM.from_entity(user)
-        user_orm = await self.repository.create(user_orm)
-        return user_orm.to_entity()
+        created = await self.repository.create(user)
+        if not created:
+            fail(UserIsExsitedException("The user is exsited. Please login account"))
+        return created
+
+    async def bulk_create(self, users: list[User]) -> list[str]:
+        return await self.repository.bulk_create(users)
 
     async def update(self, user: User) -> User:
-        user_orm = UserORM.from_entity(user)
-        user_orm = await self.repository.update(user_orm)
-        return user_orm.to_entity()
+        updated = await self.repository.update(user)
+        if not updated:
+            fail(UserIsNotFoundException)
+        return updated
 
     async def delete(self, oid: str) -> User:
-        user_orm = await self.get_by_oid(oid)
-        await self.repository.delete(oid)
-        return user_orm.to_entity()
+        deleted = await self.repository.delete(oid)
+        if not deleted:
+            fail(UserIsNotFoundException)
+        return deleted
+
+
+class UserLoader(IUserLoader):
+    """Batches the lookups made within one event-loop tick into ``get_by_oids``.
 
+    Results are memoized for the loader's lifetime, so one is built per
+    request. Every caller gets its own copy of the entity.
+    """
+
+    def __init__(self, user_service: IUserService, max_batch_size: int) -> None:
+        self.user_service = user_service
+        self._loader: BatchLoader[UUID, User] = BatchLoader(
+            self._load_many, max_batch_size
+        )
+
+    async def _load_many(self, oids: list[UUID]) -> dict[UUID, User]:
+        return {user.oid: user for user in await self.user_service.get_by_oids(oids)}
+
+    async def load(self, oid: UUID | str) -> User:
+        try:
+            key = UUID(str(oid))
+        except ValueError:
+            fail(UserIsNotFoundException)
+        user = await self._loader.load(key)
+        if user is None:
+            fail(UserIsNotFoundException)
+        return replace(user)
+
+    async def load_many(self, oids: list[UUID | str]) -> list[User]:
+        return list(await asyncio.gather(*(self.load(oid) for oid in oids)))
 
 
 @dataclass(frozen=True)
-class LoginService(ILoginService):       
-    def generate_token_and_is_active(
-        self, user: User, expire_delta: timedelta | None = None
+class LoginService(ILoginService):
+    def generate_access_token(
+        self, user_oid: str, expire_delta: timedelta | None = None
     ) -> str:
+        from jose import jwt
+
+        settings = get_settings()
         if expire_delta:
-            expire = datetime.now() + expire_delta
+            expire = datetime.now(UTC) + expire_delta
         else:
-            expire = datetime.now() + timedelta(minutes=15)
+            expire = datetime.now(UTC) + timedelta(
+                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+            )
 
-        data = {"sub": user.oid, "exp": expire}
-        encoded_jwt = jwt.encode(
-            data, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-        )
+        data = {"sub": user_oid, "exp": expire, "jti": str(uuid7())}
+        with TOKEN_ENCODE.time():
+            return jwt.encode(data, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    def generate_token_and_is_active(
+        self, user: User, expire_delta: timedelta | None = None
+    ) -> str:
+        encoded_jwt = self.generate_access_token(str(user.oid), expire_delta)
         user.is_active = True
         return encoded_jwt
+
+
+@dataclass(frozen=True)
+class RefreshTokenService(IRefreshTokenService):
+    """Opaque, rotating refresh tokens.
+
+    Only the sha256 of a token is stored, so a refresh is one indexed lookup
+    and never runs bcrypt.
+    """
+
+    repository: IRefreshTokenRepository
+
+    @staticmethod
+    def _hash(refresh_token: str) -> bytes:
+        return hashlib.sha256(refresh_token.encode()).digest()
+
+    @staticmethod
+    def _expires_at() -> datetime:
+        return datetime.now(UTC) + timedelta(
+            days=get_settings().REFRESH_TOKEN_EXPIRE_DAYS
+        )
+
+    async def issue(self, user: User) -> str:
+        refresh_token = secrets.token_urlsafe(32)
+        await self.repository.create(
+            user.oid, self._hash(refresh_token), self._expires_at()
+        )
+        return refresh_token
+
+    async def rotate(self, refresh_token: str) -> tuple[str, str]:
+        new_refresh_token = secrets.token_urlsafe(32)
+        user_oid = await self.repository.rotate(
+            self._hash(refresh_token), self._hash(new_refresh_token), self._expires_at()
+        )
+        if user_oid is None:
+            fail(TokenInvalidException("Invalid refresh token. Please login again"))
+        return str(user_oid), new_refresh_token
+
+    async def revoke(self, refresh_token: str) -> None:
+        await self.repository.revoke(self._hash(refresh_token))
+
+
+class TokenService(ITokenService):
+    """Verifies access tokens without touching the database.
+
+    Claims of verified tokens are kept in an LRU keyed by the token digest until
+    the token expires, so repeated requests skip signature verification.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, max_size: int) -> None:
+        self._secret_key = secret_key
+        self._algorithm = algorithm
+        self._claims: LRUCache[bytes, TokenClaims] = LRUCache(max_size)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._claims.stats
+
+    def verify_token(self, token: str) -> TokenClaims:
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self._claims.get(digest)
+        if claims is not None:
+            return claims
+        # python-jose pulls in cryptography, only pay for it once a token is seen
+        from jose import JWTError, jwt
+
+        try:
+            # only misses are timed, hits are visible in the cache stats
+            with TOKEN_VERIFY.time():
+                payload = jwt.decode(
+                    token, self._secret_key, algorithms=[self._algorithm]
+                )
+            claims = TokenClaims(
+                sub=payload["sub"],
+                exp=datetime.fromtimestamp(payload["exp"], UTC),
+                jti=payload.get("jti"),
+            )
+        except (JWTError, KeyError, TypeError, ValueError):
+            fail(TokenInvalidException("Invalid token. Please login again"))
+        ttl = (claims.exp - datetime.now(UTC)).total_seconds()
+        self._claims.set(digest, claims, expires_at=time.monotonic() + ttl)
+        return claims
+
+
+# revocations committed around the previous refresh may carry an earlier
+# revoked_at than the newest row it saw, so every refresh re-reads this window
+REVOCATION_REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+@dataclass(frozen=True)
+class RevocationStats:
+    revoked: int
+    bloom_bytes: int
+    bloom_false_positive_rate: float
+    confirmed: int
+    store_lookups: int
+    false_positives: int
+
+
+class TokenRevocationService(ITokenRevocationService):
+    """Answers "is this token revoked" without I/O for almost every token.
+
+    Every unexpired revoked jti is kept in a Bloom filter that is refreshed
+    incrementally from the store in the background, at most once per
+    ``refresh_interval``. A jti the filter does not contain is not revoked; only
+    possible positives are looked up in the store, and the answer is kept in an
+    exact set until the token expires. The filter is rebuilt from scratch every
+    ``rebuild_interval`` so expired tokens stop occupying it.
+    """
+
+    def __init__(
+        self,
+        repository: IRevokedTokenRepository,
+        capacity: int,
+        error_rate: float,
+        refresh_interval: float,
+        rebuild_interval: float,
+    ) -> None:
+        self._repository = repository
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._refresh_interval = refresh_interval
+        self._rebuild_interval = rebuild_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._confirmed: LRUCache[bytes, bool] = LRUCache(capacity)
+        self._watermark: datetime | None = None
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._refreshed_at = -math.inf
+        self._rebuilt_at = -math.inf
+        self._refresh_task: asyncio.Task | None = None
+        self._store_lookups = 0
+        self._false_positives = 0
+
+    @property
+    def stats(self) -> RevocationStats:
+        return RevocationStats(
+            revoked=len(self._bloom),
+            bloom_bytes=self._bloom.size_in_bytes,
+            bloom_false_positive_rate=self._bloom.false_positive_rate,
+            confirmed=len(self._confirmed),
+            store_lookups=self._store_lookups,
+            false_positives=self._false_positives,
+        )
+
+    def _add(self, key: bytes) -> None:
+        if key not in self._bloom:
+            self._bloom.add(key)
+        if self._confirmed.get(key) is False:
+            self._confirmed.pop(key)
+
+    def _confirm(self, key: bytes, revoked: bool, exp: datetime) -> None:
+        ttl = (exp - datetime.now(UTC)).total_seconds()
+        self._confirmed.set(key, revoked, expires_at=time.monotonic() + ttl)
+
+    async def refresh(self) -> None:
+        self._refreshed_at = time.monotonic()
+        if self._refreshed_at - self._rebuilt_at >= self._rebuild_interval:
+            await self._rebuild()
+            return
+        since = self._watermark - REVOCATION_REFRESH_OVERLAP
+        for jti, revoked_at in await self._repository.get_revoked_since(since):
+            self._add(str(jti).encode())
+            self._watermark = max(self._watermark, revoked_at)
+
+    async def _rebuild(self) -> None:
+        await self._repository.delete_expired()
+        rows = await self._repository.get_revoked_since(None)
+        self._bloom = BloomFilter(self._capacity, self._error_rate)
+        for jti, _ in rows:
+            self._add(str(jti).encode())
+        self._watermark = max(
+            (revoked_at for _, revoked_at in rows), default=datetime.now(UTC)
+        )
+        self._rebuilt_at = self._refreshed_at
+        self._loaded = True
+
+    async def close(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        except (SQLAlchemyError, OSError):
+            # keep answering from the current filter, the next refresh retries
+            pass
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if time.monotonic() - self._refreshed_at < self._refresh_interval:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def revoke(self, claims: TokenClaims) -> None:
+        if claims.jti is None:
+            fail(TokenInvalidException("The token can not be revoked"))
+        try:
+            jti = UUID(claims.jti)
+        except ValueError:
+            fail(TokenInvalidException("Invalid token. Please login again"))
+        await self._repository.create(jti, claims.exp)
+        key = claims.jti.encode()
+        self._add(key)
+        self._confirm(key, True, claims.exp)
+
+    async def is_revoked(self, claims: TokenClaims) -> bool:
+        if claims.jti is None:
+            return False
+        if not self._loaded:
+            # an empty filter would clear every token, so the first load blocks
+            async with self._load_lock:
+                if not self._loaded:
+                    await self.refresh()
+        else:
+            self._schedule_refresh()
+        key = claims.jti.encode()
+        if key not in self._bloom:
+            return False
+        revoked = self._confirmed.get(key)
+        if revoked is None:
+            self._store_lookups += 1
+            try:
+                revoked = await self._repository.exists(UUID(claims.jti))
+            except ValueError:
+                fail(TokenInvalidException("Invalid token. Please login again"))
+            if not revoked:
+                self._false_positives += 1
+            self._confirm(key, revoked, claims.exp)
+        return revoked
@@ -1,6 +1,175 @@
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+import punq
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from prometheus_client import REGISTRY
+
+from src.api.metrics.routers import router as metrics_router
+from src.api.responses import MsgspecJSONResponse
+from src.api.v1.routers import router as v1_router
+from src.core.config.containers import get_container
+from src.core.config.settings import get_settings
+from src.domain.base.errors import InvalidCursorException
+from src.domain.user.errors import (
+    CrendentialUserException,
+    TokenInvalidException,
+    UserIsExsitedException,
+    UserIsNotFoundException,
+)
+from src.domain.user.services import ITokenRevocationService, ITokenService
+from src.helper.compression import CompressionMiddleware
+from src.helper.errors import ServiceOverloadedException
+from src.helper.metrics import MetricsMiddleware, StatsCollector
+from src.infrastructure.cache.code import ICodeStore
+from src.infrastructure.cache.user import (
+    CachedUserRepository,
+    SingleFlightUserRepository,
+)
+from src.infrastructure.email.dispatcher import (
+    IEmailDispatcher,
+    SendGridEmailDispatcher,
+)
+from src.infrastructure.postgresql.database import Database
+from src.infrastructure.postgresql.queries.warm_up import warm_up_statements
+from src.infrastructure.postgresql.repositories.user import IUserRepository
+from src.service.hashing import PasswordHashingPool
+from src.service.user import TokenRevocationService, TokenService
+
+
+def stats_collector(container: punq.Container) -> StatsCollector:
+    database: Database = container.resolve(Database)
+    pool: PasswordHashingPool = container.resolve(PasswordHashingPool)
+    sources = {
+        "database_pool": database.pool_stats,
+        "password_hashing": lambda: {"bcrypt": pool.stats},
+    }
+    token_service = container.resolve(ITokenService)
+    if isinstance(token_service, TokenService):
+        sources["token_cache"] = lambda: {"claims": token_service.stats}
+    repository = container.resolve(IUserRepository)
+    if isinstance(repository, CachedUserRepository):
+        cache = repository
+        sources["user_cache"] = lambda: {"users": cache.stats}
+        repository = cache.repository
+    if isinstance(repository, SingleFlightUserRepository):
+        flights = repository
+        sources["user_single_flight"] = lambda: flights.stats
+    dispatcher = container.resolve(IEmailDispatcher)
+    if isinstance(dispatcher, SendGridEmailDispatcher):
+        sources["email_dispatch"] = lambda: {"sendgrid": dispatcher.stats}
+    return StatsCollector(sources)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    settings = get_settings()
+    container = get_container()
+    pool: PasswordHashingPool = container.resolve(PasswordHashingPool)
+    database: Database = container.resolve(Database)
+    revocation: ITokenRevocationService = container.resolve(ITokenRevocationService)
+    dispatcher: IEmailDispatcher = container.resolve(IEmailDispatcher)
+    code_store: ICodeStore = container.resolve(ICodeStore)
+
+    async def warm_up_hashing() -> None:
+        if settings.BCRYPT_ROUNDS is None and settings.BCRYPT_TARGET_VERIFY_SECONDS:
+            await pool.calibrate(
+                settings.BCRYPT_TARGET_VERIFY_SECONDS,
+                settings.BCRYPT_MIN_ROUNDS,
+                settings.BCRYPT_MAX_ROUNDS,
+            )
+        await pool.warm_up()
+
+    async def warm_up_database() -> None:
+        if settings.POSTGRES_WARM_UP_CONNECTIONS > 0:
+            await database.warm_up(
+                settings.POSTGRES_WARM_UP_CONNECTIONS, warm_up_statements()
+            )
+            if isinstance(revocation, TokenRevocationService):
+                await revocation.refresh()
+
+    await asyncio.gather(warm_up_hashing(), warm_up_database())
+    collector = stats_collector(container) if settings.METRICS_ENABLED else None
+    if collector is not None:
+        REGISTRY.register(collector)
+    yield
+    if collector is not None:
+        REGISTRY.unregister(collector)
+    # uvicorn has finished the in-flight requests by now
+    await dispatcher.close()
+    await code_store.close()
+    if isinstance(revocation, TokenRevocationService):
+        await revocation.close()
+    await database.dispose()
+    pool.shutdown()
+
+
+async def service_overloaded_handler(
+    request: Request, exc: ServiceOverloadedException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def invalid_cursor_handler(
+    request: Request, exc: InvalidCursorException
+) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+async def token_invalid_handler(
+    request: Request, exc: TokenInvalidException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=401,
+        content={"detail": str(exc)},
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def user_not_found_handler(
+    request: Request, exc: UserIsNotFoundException
+) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"detail": "The user is not found"})
+
+
+async def credential_handler(
+    request: Request, exc: CrendentialUserException
+) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+async def user_existed_handler(
+    request: Request, exc: UserIsExsitedException
+) -> JSONResponse:
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
 
 
 def init_app():
-    app = FastAPI(docs_url="/api/v1/docs", debug=True)
+    settings = get_settings()
+    app = FastAPI(
+        docs_url="/api/v1/docs",
+        debug=settings.DEBUG,
+        lifespan=lifespan,
+        default_response_class=MsgspecJSONResponse,
+    )
+    app.include_router(v1_router)
+    if settings.RESPONSE_COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE
+        )
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
+        app.add_middleware(MetricsMiddleware)
+    app.add_exception_handler(ServiceOverloadedException, service_overloaded_handler)
+    app.add_exception_handler(InvalidCursorException, invalid_cursor_handler)
+    app.add_exception_handler(TokenInvalidException, token_invalid_handler)
+    app.add_exception_handler(UserIsNotFoundException, user_not_found_handler)
+    app.add_exception_handler(UserIsExsitedException, user_existed_handler)
+    app.add_exception_handler(CrendentialUserException, credential_handler)
     return app